@@ -1,27 +1,110 @@
 # app/main.py
 import os
-from fastapi import FastAPI, Form, File, UploadFile
+import zlib
+import asyncio
+import contextlib
+import anyio
+import orjson
+from fastapi import FastAPI, Form, File, UploadFile, Request, Response, HTTPException
+from fastapi.routing import APIRoute
 from fastapi.middleware.cors import CORSMiddleware
 from utils import db_utils
 from utils import user_utils
 from utils import clothing_utils
 from app import services
-from app.models import User, OutfitRequest, ClothingDescription, OutfitWithAvatarRequest
+from app.models import User, OutfitRequest, ClothingDescription, ClothingDescriptionBulk, OutfitWithAvatarRequest
 import logging
 import base64
 import time
 
 logger = logging.getLogger(__name__)
 
+# Largest request body accepted once gunzipped, so a small gzip bomb can't exhaust memory
+MAX_DECOMPRESSED_BODY_BYTES = int(os.getenv("MAX_DECOMPRESSED_BODY_BYTES", str(16 * 1024 * 1024)))
+
+# Request that transparently gunzips bodies sent with Content-Encoding: gzip
+class GzipRequest(Request):
+    async def body(self) -> bytes:
+        if not hasattr(self, "_body"):
+            body = await super().body()
+            if "gzip" in self.headers.getlist("Content-Encoding"):
+                body = _gunzip_limited(body, MAX_DECOMPRESSED_BODY_BYTES)
+            self._body = body
+        return self._body
+
+def _gunzip_limited(data: bytes, limit: int) -> bytes:
+    """
+    Gunzip data, stopping with a 413 as soon as the output would exceed limit bytes
+    """
+    decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    try:
+        body = decompressor.decompress(data, limit + 1)
+    except zlib.error:
+        raise HTTPException(status_code=400, detail="Invalid gzip request body")
+    if len(body) > limit or decompressor.unconsumed_tail:
+        raise HTTPException(status_code=413, detail="Decompressed request body too large")
+    return body
+
+class GzipRoute(APIRoute):
+    def get_route_handler(self):
+        original_route_handler = super().get_route_handler()
+
+        async def custom_route_handler(request: Request):
+            request = GzipRequest(request.scope, request.receive)
+            return await original_route_handler(request)
+
+        return custom_route_handler
+
 # Initialize FastAPI app
 app = FastAPI(title="fAIshion API", description="Fashion API with SQLite Database")
+# Accept gzip-compressed request bodies on every route declared below
+app.router.route_class = GzipRoute
+
+# Last database health probe, refreshed in the background so /health never blocks on the DB
+HEALTH_TTL_SECONDS = 5
+_HEALTH = {"ts": 0.0, "status": "unknown", "error": None}
+_HEALTH_LOCK = asyncio.Lock()
+_health_task = None
+
+async def _refresh_health():
+    db_status = await asyncio.to_thread(db_utils.check_db_connection)
+    _HEALTH.update(
+        ts=time.monotonic(),
+        status=db_status["status"],
+        error=db_status.get("error_message", None)
+    )
+
+async def _health_refresher():
+    while True:
+        try:
+            async with _HEALTH_LOCK:
+                await _refresh_health()
+        except Exception as e:
+            logger.error(f"Health refresh failed: {str(e)}")
+        await asyncio.sleep(HEALTH_TTL_SECONDS)
+
+# Route handlers that touch SQLite or blocking HTTP clients are plain "def", so Starlette
+# runs them in its worker threads; allow more of them than anyio's default of 40.
+# The suggestion routes share services.outfit_suggester, which keeps no per-call state.
+THREADPOOL_TOKENS = int(os.getenv("THREADPOOL_TOKENS", "200"))
 
 # Initialize DB on startup
 @app.on_event("startup")
 async def startup_event():
+    global _health_task
     logger.info("Application starting...")  # replaced print
+    anyio.to_thread.current_default_thread_limiter().total_tokens = THREADPOOL_TOKENS
     db_utils.init_db()
     logger.info("Database initialization completed.")  # replaced print
+    _health_task = asyncio.create_task(_health_refresher())
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    if _health_task:
+        _health_task.cancel()
+        # Wait for the refresher to finish cancelling before the event loop goes away
+        with contextlib.suppress(asyncio.CancelledError):
+            await _health_task
 
 # Enable CORS
 app.add_middleware(
@@ -40,17 +123,19 @@ async def hello_world():
 @app.get("/health")
 async def health():
     try:
-        print("Health check requested")
-        db_status = db_utils.check_db_connection()
-        print(f"DB status: {db_status}")
+        # Serve the cached probe; only hit the DB if the background refresh has fallen behind
+        if time.monotonic() - _HEALTH["ts"] >= HEALTH_TTL_SECONDS:
+            async with _HEALTH_LOCK:
+                if time.monotonic() - _HEALTH["ts"] >= HEALTH_TTL_SECONDS:
+                    await _refresh_health()
         
         return {
             "status": "healthy",
-            "database_status": db_status["status"],
-            "error": db_status.get("error_message", None)
+            "database_status": _HEALTH["status"],
+            "error": _HEALTH["error"]
         }
     except Exception as e:
-        print(f"Health check error: {str(e)}")
+        logger.error(f"Health check error: {str(e)}")
         return {
             "status": "error",
             "message": f"Health check failed: {str(e)}"
@@ -58,22 +143,22 @@ async def health():
 
 # Health check for DB tables
 @app.get("/tables")
-async def list_tables():
+def list_tables():
     return db_utils.get_tables()
 
 # User endpoints
 @app.post("/register", status_code=201)
-async def register(user: User):
+def register(user: User):
     return user_utils.register_user(user.username, user.password)
 
 @app.post("/login")
-async def login(user: User):
+def login(user: User):
     return user_utils.verify_user(user.username, user.password)
 
 
 # Endpoint for uploading clothing by description
 @app.post("/upload-clothing/description")
-async def upload_clothing(clothingItem: ClothingDescription):
+def upload_clothing(clothingItem: ClothingDescription):
     try:
         result = clothing_utils.add_clothing_item(
             user_id=clothingItem.userId,
@@ -84,9 +169,33 @@ async def upload_clothing(clothingItem: ClothingDescription):
 
     return {"message": "Clothing item uploaded successfully", "result": result}
 
+# Endpoint for uploading many clothing descriptions in one request
+@app.post("/upload-clothing/bulk")
+def upload_clothing_bulk(clothingItems: ClothingDescriptionBulk):
+    try:
+        result = clothing_utils.add_clothing_items_bulk(
+            user_id=clothingItems.userId,
+            items=clothingItems.descriptions
+        )
+    except HTTPException:
+        # Unknown user (404) and database errors (500) keep their status code
+        raise
+    except Exception as e:
+        return {"error": "Failed to save clothing items", "details": str(e)}
+
+    return {"message": "Clothing items uploaded successfully", "result": result}
+
+# Endpoint for listing a user's clothing descriptions, served from the per-user cache
+@app.get("/clothing/descriptions")
+def list_clothing_descriptions(userId: str):
+    # Connection failures propagate as HTTPException from the pool
+    descriptions = clothing_utils.get_all_clothing_descriptions(userId)
+    # A list of strings needs no jsonable_encoder pass, so serialize it straight into the response
+    return Response(content=orjson.dumps(descriptions), media_type="application/json")
+
 # Endpoint for uploading clothing by image
 @app.post("/upload-clothing/image")
-async def upload_clothing_image(
+def upload_clothing_image(
     userId: str = Form(...),
     file: UploadFile = File(...)
 ):
@@ -111,7 +220,7 @@ async def upload_clothing_image(
 
 # Endpoint for suggesting an outfit
 @app.get("/suggest-outfit")
-async def suggest_outfit(
+def suggest_outfit(
     outfitRequest: OutfitRequest
 ):
     """
@@ -147,7 +256,7 @@ async def suggest_outfit(
     }
 
 @app.get("/suggest-outfit-with-avatar")
-async def suggest_outfit_with_avatar(
+def suggest_outfit_with_avatar(
     outfitRequest: OutfitWithAvatarRequest
 ):
     """
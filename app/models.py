@@ -1,6 +1,6 @@
 from pydantic import BaseModel
 from fastapi import UploadFile, Form, File
-from typing import Optional
+from typing import List, Optional
 
 # Model for user registration and login
 class User(BaseModel):
@@ -12,6 +12,11 @@ class ClothingDescription(BaseModel):
     userId: str
     description: str
 
+# Model for uploading several clothing descriptions at once
+class ClothingDescriptionBulk(BaseModel):
+    userId: str
+    descriptions: List[str]
+
 # Model for clothing item upload with image
 class ClothingImage(BaseModel):
     userId: str
@@ -0,0 +1,84 @@
+# cython: language_level=3, boundscheck=False, wraparound=False, cdivision=True
+# distutils: extra_compile_args = -O3 -march=native
+"""Compiled scoring kernels for OutfitSuggester.
+
+Optional: build in place with `cythonize -i ml/_kernels.pyx`. When the
+extension is not built, ml.outfit_suggester falls back to the NumPy versions.
+"""
+import numpy as np
+from libc.stdint cimport uint64_t
+
+
+def weather_scores(const float[:, ::1] seasonality, const float[::1] season_weights,
+                   const uint64_t[::1] material_mask, const uint64_t[::1] good_masks,
+                   const uint64_t[::1] bad_masks, const float[::1] material_weights,
+                   const float[::1] wet_bonus, bint is_wet):
+    """Weather appropriateness (0-1) for every item."""
+    cdef Py_ssize_t n_items = seasonality.shape[0]
+    cdef Py_ssize_t n_seasons = seasonality.shape[1]
+    cdef Py_ssize_t n_weather = good_masks.shape[0]
+    cdef Py_ssize_t i, j
+    cdef double weather_score, material_score, combined
+    cdef uint64_t mask
+
+    out = np.empty(n_items, dtype=np.float32)
+    cdef float[::1] out_view = out
+
+    for i in range(n_items):
+        # Season-based score
+        weather_score = 0.0
+        for j in range(n_seasons):
+            weather_score += <double>seasonality[i, j] * season_weights[j]
+
+        # Material-based score
+        material_score = 0.5
+        mask = material_mask[i]
+        for j in range(n_weather):
+            if mask & good_masks[j]:
+                material_score += material_weights[j]
+            if mask & bad_masks[j]:
+                material_score -= material_weights[j]
+
+        # Pattern and type consideration for wet weather
+        if is_wet:
+            weather_score += wet_bonus[i]
+
+        combined = weather_score * 0.7 + material_score * 0.3
+        out_view[i] = 1.0 if combined > 1.0 else (0.0 if combined < 0.0 else combined)
+
+    return out
+
+
+def formality_scores(const float[::1] formality, double occasion_formality):
+    """Formality match (0-1) for every item against the occasion."""
+    cdef Py_ssize_t n_items = formality.shape[0]
+    cdef Py_ssize_t i
+    cdef double item_formality, diff, penalty, score
+
+    out = np.empty(n_items, dtype=np.float32)
+    cdef float[::1] out_view = out
+
+    for i in range(n_items):
+        item_formality = formality[i]
+        diff = item_formality - occasion_formality
+        if diff < 0:
+            diff = -diff
+
+        # Underdressing is penalized harder; slight overdressing gets a discount
+        if item_formality < occasion_formality:
+            penalty = 1.5 * diff
+        else:
+            penalty = 0.8 * diff
+            if diff < 2:
+                penalty *= 0.8
+        if diff > 5:
+            penalty *= 1.5
+
+        score = 1 - penalty / 10
+        if score < 0:
+            score = 0
+        if diff < 0.5:
+            score = score + 0.2 if score + 0.2 < 1.0 else 1.0
+        out_view[i] = score
+
+    return out
@@ -7,13 +7,15 @@ from sklearn.compose import ColumnTransformer
 from sklearn.pipeline import Pipeline
 import spacy
 import re
-from typing import List, Dict, Any, Tuple
+from typing import List, Dict, Any, Tuple, Union
 import pickle
 import os
+import threading
 import joblib
 from sklearn.neighbors import NearestNeighbors
 from sklearn.cluster import KMeans
-from collections import Counter
+from collections import OrderedDict
+from functools import lru_cache
 
 # Load spaCy model for NLP processing
 try:
@@ -25,8 +27,154 @@ except:
     print("python -m spacy download en_core_web_sm")
     raise
 
+
+def _py_weather_scores(seasonality, season_weights, material_mask, good_masks, bad_masks,
+                       material_weights, wet_bonus, is_wet):
+    """NumPy weather appropriateness kernel (0-1 per item)."""
+    # Season-based score: (N, 4) @ (4,)
+    weather_score = seasonality @ season_weights
+
+    # Material-based score from the material bitmasks, shape (N, W)
+    has_good = (material_mask[:, None] & good_masks) != 0
+    has_bad = (material_mask[:, None] & bad_masks) != 0
+    material_score = 0.5 + (has_good.astype(np.float32) - has_bad) @ material_weights
+
+    # Pattern and type consideration for wet weather
+    if is_wet:
+        weather_score = weather_score + wet_bonus
+
+    # Combine scores (with more weight on seasonality than materials)
+    return np.clip(weather_score * 0.7 + material_score * 0.3, 0.0, 1.0)
+
+
+def _py_formality_scores(formality, occasion_formality):
+    """NumPy formality match kernel (0-1 per item)."""
+    diff = np.abs(formality - occasion_formality)
+
+    # Underdressing is penalized harder; slight overdressing gets a discount
+    penalty = np.where(
+        formality < occasion_formality,
+        1.5 * diff,
+        0.8 * diff * np.where(diff < 2, 0.8, 1.0)
+    )
+    penalty = np.where(diff > 5, penalty * 1.5, penalty)
+
+    score = np.maximum(0, 1 - (penalty / 10))
+    return np.where(diff < 0.5, np.minimum(1.0, score + 0.2), score)
+
+
+# Use the compiled kernels when the Cython extension has been built
+try:
+    from ml._kernels import weather_scores, formality_scores
+except ImportError:
+    weather_scores = _py_weather_scores
+    formality_scores = _py_formality_scores
+
+# Parallel scoring over items when numba is available
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+
+if njit is not None:
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _score_all_parallel(seasonality, season_weights, material_mask, good_masks, bad_masks,
+                            material_weights, wet_bonus, is_wet, formality, occasion_formality):
+        """Combined weather + formality score for every item, one item per prange iteration."""
+        n_items = seasonality.shape[0]
+        overall = np.empty(n_items, dtype=np.float64)
+        for i in prange(n_items):
+            # Weather appropriateness
+            weather_score = 0.0
+            for j in range(seasonality.shape[1]):
+                weather_score += seasonality[i, j] * season_weights[j]
+            material_score = 0.5
+            for j in range(good_masks.shape[0]):
+                if material_mask[i] & good_masks[j]:
+                    material_score += material_weights[j]
+                if material_mask[i] & bad_masks[j]:
+                    material_score -= material_weights[j]
+            if is_wet:
+                weather_score += wet_bonus[i]
+            weather = min(1.0, max(0.0, weather_score * 0.7 + material_score * 0.3))
+
+            # Formality match
+            diff = abs(formality[i] - occasion_formality)
+            if formality[i] < occasion_formality:
+                penalty = 1.5 * diff
+            else:
+                penalty = 0.8 * diff
+                if diff < 2:
+                    penalty *= 0.8
+            if diff > 5:
+                penalty *= 1.5
+            formality_score = max(0.0, 1 - penalty / 10)
+            if diff < 0.5:
+                formality_score = min(1.0, formality_score + 0.2)
+
+            overall[i] = weather * 0.4 + formality_score * 0.6
+        return overall
+else:
+    _score_all_parallel = None
+
 class OutfitSuggester:
-    def __init__(self, models_path=None):
+    CATEGORIES = ['top', 'bottom', 'one_piece', 'outerwear', 'footwear', 'accessory']
+    SEASONS = ['spring', 'summer', 'fall', 'winter']
+    FEATURE_CACHE_SIZE = 4096
+    # Wardrobes smaller than this are scored serially; thread startup isn't worth it
+    PARALLEL_SCORING_THRESHOLD = 64
+
+    # Category vocabulary in priority order: the first category with a matching term wins
+    CATEGORY_TERMS = (
+        ('top', (
+            't-shirt', 'shirt', 'blouse', 'sweater', 'sweatshirt', 'hoodie', 'polo',
+            'tank', 'turtleneck', 'cardigan', 'tunic', 'button-down', 'henley',
+            'crop top', 'camisole', 'pullover', 'jersey', 'top'
+        )),
+        ('bottom', (
+            'jeans', 'pants', 'trousers', 'shorts', 'skirt', 'chinos', 'leggings',
+            'joggers', 'sweatpants', 'culottes', 'capris', 'jeggings', 'cargo',
+            'khakis', 'slacks', 'dress pants', 'bermudas', 'palazzo', 'linen pants'
+        )),
+        ('one_piece', (
+            'dress', 'jumpsuit', 'romper', 'playsuit', 'gown', 'sundress', 'maxi',
+            'midi', 'mini', 'shift', 'sheath', 'a-line', 'wrap', 'slip dress'
+        )),
+        ('outerwear', (
+            'jacket', 'coat', 'blazer', 'parka', 'windbreaker', 'vest',
+            'trench', 'bomber', 'denim jacket', 'leather jacket', 'puffer', 'raincoat',
+            'poncho', 'peacoat', 'overcoat', 'anorak', 'cape', 'shrug'
+        )),
+        ('footwear', (
+            'shoes', 'boots', 'sneakers', 'sandals', 'loafers', 'flats', 'heels',
+            'pumps', 'wedges', 'oxford shoes', 'slippers', 'mules', 'espadrilles',
+            'mocassins', 'brogues', 'ankle boots', 'hiking boots', 'slip-ons'
+        )),
+        ('accessory', (
+            'watch', 'scarf', 'tie', 'belt', 'hat', 'gloves', 'socks', 'necklace',
+            'earrings', 'bracelet', 'ring', 'sunglasses', 'bag', 'purse', 'handbag',
+            'wallet', 'backpack', 'tote', 'clutch', 'headband', 'beanie', 'cap',
+            'beret', 'bowtie', 'pocket square', 'cufflinks', 'anklet', 'brooch'
+        )),
+    )
+    # Term -> category and category -> priority, so type names are matched with dict lookups
+    _TERM_CATEGORY = {term: category for category, terms in CATEGORY_TERMS for term in terms}
+    _CATEGORY_RANK = {category: rank for rank, (category, _) in enumerate(CATEGORY_TERMS)}
+
+    # Record layout returned by process_clothing_items
+    ITEM_DTYPE = np.dtype([
+        ('description', object),
+        ('category', 'U16'),
+        ('formality', 'f4'),
+        ('versatility', 'f4'),
+        ('seasonality', 'f4', (4,)),
+        ('pattern', 'i1'),
+    ])
+
+    def __init__(self, models_path=None, return_dataframe=False):
+        # process_clothing_items returns a DataFrame instead of a structured array when set
+        self.return_dataframe = return_dataframe
+        
         # Initialize feature extractors with expanded vocabularies
         self.color_vectorizer = TfidfVectorizer(vocabulary=self._get_color_list())
         self.material_vectorizer = TfidfVectorizer(vocabulary=self._get_material_list())
@@ -117,7 +265,70 @@ class OutfitSuggester:
             },
             'neutral_base': ['black', 'white', 'gray', 'navy', 'beige', 'tan', 'khaki', 'cream', 'brown']
         }
-        
+
+        # Freeze the color families so coordination checks are set intersections
+        self.color_coordination['complementary'] = {
+            color: frozenset(colors) for color, colors in self.color_coordination['complementary'].items()
+        }
+        self.color_coordination['monochromatic'] = {
+            family: frozenset(colors) for family, colors in self.color_coordination['monochromatic'].items()
+        }
+        self.color_coordination['neutral_base'] = frozenset(self.color_coordination['neutral_base'])
+        self._neutral_set = self.color_coordination['neutral_base']
+
+        # Map weather categories to seasons more precisely
+        self.weather_season_map = {
+            'hot': {'summer': 0.8, 'spring': 0.2},
+            'cold': {'winter': 0.8, 'fall': 0.2},
+            'wet': {'fall': 0.4, 'spring': 0.4, 'winter': 0.2},
+            'windy': {'fall': 0.5, 'spring': 0.3, 'winter': 0.2},
+            'mild': {'spring': 0.5, 'fall': 0.3, 'summer': 0.2}
+        }
+
+        # Material appropriateness for weather
+        self.material_weather_suitability = {
+            'hot': {
+                'good': ['cotton', 'linen', 'silk', 'rayon', 'chambray'],
+                'bad': ['wool', 'leather', 'fleece', 'velvet', 'cashmere']
+            },
+            'cold': {
+                'good': ['wool', 'cashmere', 'fleece', 'leather', 'down', 'fur', 'sherpa'],
+                'bad': ['linen', 'silk', 'mesh', 'chiffon']
+            },
+            'wet': {
+                'good': ['polyester', 'nylon', 'gore-tex', 'vinyl', 'leather', 'wool'],
+                'bad': ['suede', 'silk', 'cotton', 'velvet']
+            },
+            'windy': {
+                'good': ['leather', 'denim', 'wool', 'polyester', 'nylon'],
+                'bad': ['silk', 'light cotton', 'chiffon', 'loose weave']
+            }
+        }
+
+        # Patterns and footwear that hold up in wet weather
+        self.wet_weather_patterns = ['dark', 'patterned', 'print', 'plaid']
+        self.wet_weather_footwear = ['boots', 'waterproof', 'water-resistant']
+
+        # Pattern keywords, checked in order
+        self.pattern_keywords = {
+            'solid': ['solid', 'plain', 'basic', 'single color', 'one color'],
+            'striped': ['stripe', 'striped', 'stripes', 'pinstripe', 'vertical stripe', 'horizontal stripe'],
+            'plaid': ['plaid', 'tartan', 'check', 'checked', 'checkered', 'gingham'],
+            'floral': ['floral', 'flower', 'flowers', 'botanical', 'rose', 'daisy'],
+            'polka dot': ['polka dot', 'polka-dot', 'dots', 'spotted', 'dot pattern'],
+            'animal print': ['animal print', 'leopard', 'zebra', 'cheetah', 'snake', 'python', 'crocodile', 'tiger'],
+            'geometric': ['geometric', 'triangle', 'square', 'diamond pattern', 'hexagon', 'chevron', 'zigzag'],
+            'print': ['print', 'pattern', 'graphic', 'design', 'logo', 'motif'],
+            'colorblock': ['colorblock', 'color-block', 'color block', 'two-tone', 'two tone']
+        }
+
+        # Build lookup tables for the columnar (float32) item feature arrays
+        self._build_lookup_tables()
+
+        # LRU cache of extracted features keyed by the raw description, shared by request threads
+        self._feat_cache = OrderedDict()
+        self._feat_cache_lock = threading.Lock()
+
         # Initialize models
         self.top_model = None
         self.bottom_model = None
@@ -210,10 +421,50 @@ class OutfitSuggester:
         except Exception as e:
             print(f"Error loading models: {e}")
             self._initialize_models()
-    
-    def _get_color_list(self) -> List[str]:
-        """Return an expanded list of common clothing colors."""
-        return [
+
+    def _build_lookup_tables(self):
+        """Precompute bitmasks and matrices used by the columnar scoring kernels."""
+        # One bit per vocabulary entry (colors and materials both fit in 64 bits)
+        self._color_bits = {color: 1 << i for i, color in enumerate(self._get_color_list())}
+        self._material_bits = {material: 1 << i for i, material in enumerate(self._get_material_list())}
+
+        # Weather category x season weights, shape (W, 4)
+        self._season_map = np.array([
+            [self.weather_season_map.get(weather_cat, {}).get(season, 0.0) for season in self.SEASONS]
+            for weather_cat in self.weather_categories
+        ], dtype=np.float32)
+
+        # Good/bad material bitmasks per weather category, shape (W,)
+        def material_mask(materials):
+            return sum(self._material_bits.get(material, 0) for material in set(materials))
+
+        self._good_material_masks = np.array([
+            material_mask(self.material_weather_suitability.get(weather_cat, {}).get('good', []))
+            for weather_cat in self.weather_categories
+        ], dtype=np.uint64)
+        self._bad_material_masks = np.array([
+            material_mask(self.material_weather_suitability.get(weather_cat, {}).get('bad', []))
+            for weather_cat in self.weather_categories
+        ], dtype=np.uint64)
+
+        # Integer codes for categorical attributes
+        self._category_codes = {category: i for i, category in enumerate(self.CATEGORIES)}
+        self._pattern_codes = {pattern: i for i, pattern in enumerate(self.pattern_keywords)}
+        self._wet_pattern_codes = np.array([
+            self._pattern_codes[pattern] for pattern in self.wet_weather_patterns if pattern in self._pattern_codes
+        ], dtype=np.int8)
+
+        # Clothing types that count as wet-weather footwear
+        self._wet_footwear_types = np.array([
+            any(term in type_name for term in self.wet_weather_footwear)
+            for type_name in self._get_clothing_types()
+        ], dtype=bool)
+
+    @staticmethod
+    @lru_cache(maxsize=1)
+    def _get_color_list() -> Tuple[str, ...]:
+        """Return an expanded list of common clothing colors (cached, immutable)."""
+        return (
             'red', 'blue', 'green', 'yellow', 'black', 'white', 'grey', 'gray',
             'purple', 'pink', 'orange', 'brown', 'navy', 'beige', 'cream', 'tan',
             'olive', 'burgundy', 'charcoal', 'silver', 'gold', 'teal', 'khaki',
@@ -221,11 +472,13 @@ class OutfitSuggester:
             'lavender', 'peach', 'rust', 'emerald', 'ochre', 'crimson', 'azure',
             'lilac', 'amber', 'salmon', 'slate', 'mauve', 'taupe', 'cerulean',
             'ivory', 'camel', 'sage', 'periwinkle', 'plum', 'cobalt', 'fuchsia'
-        ]
+        )
     
-    def _get_material_list(self) -> List[str]:
-        """Return an expanded list of common clothing materials."""
-        return [
+    @staticmethod
+    @lru_cache(maxsize=1)
+    def _get_material_list() -> Tuple[str, ...]:
+        """Return an expanded list of common clothing materials (cached, immutable)."""
+        return (
             'cotton', 'wool', 'leather', 'denim', 'silk', 'linen', 'polyester',
             'nylon', 'cashmere', 'velvet', 'suede', 'corduroy', 'fleece', 'tweed',
             'jersey', 'canvas', 'chino', 'flannel', 'chenille', 'satin', 'viscose',
@@ -233,11 +486,13 @@ class OutfitSuggester:
             'modal', 'twill', 'chambray', 'terry', 'mesh', 'sequin', 'bamboo',
             'microfiber', 'gabardine', 'herringbone', 'poplin', 'organza', 'taffeta',
             'fur', 'faux fur', 'sherpa', 'crepe', 'lamé', 'oxford', 'gore-tex'
-        ]
+        )
     
-    def _get_clothing_types(self) -> List[str]:
-        """Return an expanded list of common clothing type categories."""
-        return [
+    @staticmethod
+    @lru_cache(maxsize=1)
+    def _get_clothing_types() -> Tuple[str, ...]:
+        """Return an expanded list of common clothing type categories (cached, immutable)."""
+        return (
             # Tops
             't-shirt', 'shirt', 'blouse', 'sweater', 'sweatshirt', 'hoodie', 
             'polo', 'tank', 'turtleneck', 'tunic', 'button-down',
@@ -263,7 +518,7 @@ class OutfitSuggester:
             'earrings', 'bracelet', 'ring', 'sunglasses', 'bag', 'purse', 'handbag',
             'wallet', 'backpack', 'tote', 'clutch', 'headband', 'beanie', 'cap',
             'beret', 'bowtie', 'pocket square', 'cufflinks', 'anklet', 'brooch'
-        ]
+        )
     
     def _extract_features_from_description(self, description: str) -> Dict[str, Any]:
         """Extract comprehensive features from a clothing item description using advanced NLP."""
@@ -328,6 +583,7 @@ class OutfitSuggester:
             'description': description,
             'color_features': color_features,
             'color_names': color_names,
+            'color_set': frozenset(color_names),
             'material_features': material_features,
             'material_names': material_names,
             'type_features': type_features,
@@ -343,67 +599,43 @@ class OutfitSuggester:
             'descriptive_adjectives': descriptive_adjectives
         }
     
+    def _get_item_features(self, description: str) -> Dict[str, Any]:
+        """Return the features for a description, extracting them only on a cache miss."""
+        with self._feat_cache_lock:
+            features = self._feat_cache.get(description)
+            if features is not None:
+                self._feat_cache.move_to_end(description)
+                return features
+
+        # Extract outside the lock so other requests aren't held up behind spaCy
+        features = self._extract_features_from_description(description)
+        with self._feat_cache_lock:
+            self._feat_cache[description] = features
+            if len(self._feat_cache) > self.FEATURE_CACHE_SIZE:
+                self._feat_cache.popitem(last=False)
+        return features
+    
     def _determine_category(self, description: str, type_features: np.ndarray, type_names: List[str]) -> str:
         """Enhanced category determination with better accuracy."""
         desc_lower = description.lower()
         
-        # Define comprehensive category mappings
-        category_mappings = {
-            'top': [
-                't-shirt', 'shirt', 'blouse', 'sweater', 'sweatshirt', 'hoodie', 'polo', 
-                'tank', 'turtleneck', 'cardigan', 'tunic', 'button-down', 'henley', 
-                'crop top', 'camisole', 'pullover', 'jersey', 'top'
-            ],
-            'bottom': [
-                'jeans', 'pants', 'trousers', 'shorts', 'skirt', 'chinos', 'leggings',
-                'joggers', 'sweatpants', 'culottes', 'capris', 'jeggings', 'cargo',
-                'khakis', 'slacks', 'dress pants', 'bermudas', 'palazzo', 'linen pants'
-            ],
-            'one_piece': [
-                'dress', 'jumpsuit', 'romper', 'playsuit', 'gown', 'sundress', 'maxi',
-                'midi', 'mini', 'shift', 'sheath', 'a-line', 'wrap', 'slip dress'
-            ],
-            'outerwear': [
-                'jacket', 'coat', 'blazer', 'parka', 'windbreaker', 'vest', 
-                'trench', 'bomber', 'denim jacket', 'leather jacket', 'puffer', 'raincoat',
-                'poncho', 'peacoat', 'overcoat', 'anorak', 'cape', 'shrug'
-            ],
-            'footwear': [
-                'shoes', 'boots', 'sneakers', 'sandals', 'loafers', 'flats', 'heels',
-                'pumps', 'wedges', 'oxford shoes', 'slippers', 'mules', 'espadrilles',
-                'mocassins', 'brogues', 'ankle boots', 'hiking boots', 'slip-ons'
-            ],
-            'accessory': [
-                'watch', 'scarf', 'tie', 'belt', 'hat', 'gloves', 'socks', 'necklace',
-                'earrings', 'bracelet', 'ring', 'sunglasses', 'bag', 'purse', 'handbag',
-                'wallet', 'backpack', 'tote', 'clutch', 'headband', 'beanie', 'cap',
-                'beret', 'bowtie', 'pocket square', 'cufflinks', 'anklet', 'brooch'
-            ]
-        }
-        
         # Check if any type names match a category
-        for category, terms in category_mappings.items():
-            if any(term in type_names for term in terms):
-                # Special case for cardigans (can be top or outerwear)
-                if 'cardigan' in type_names:
-                    # If explicitly described as outerwear
-                    if any(term in desc_lower for term in ['layer', 'jacket', 'coat', 'outerwear']):
-                        return 'outerwear'
-                    else:
-                        return 'top'
-                return category
+        matched = [self._TERM_CATEGORY[name] for name in type_names if name in self._TERM_CATEGORY]
+        if matched:
+            # Special case for cardigans (can be top or outerwear)
+            if 'cardigan' in type_names:
+                # If explicitly described as outerwear
+                if any(term in desc_lower for term in ['layer', 'jacket', 'coat', 'outerwear']):
+                    return 'outerwear'
+                else:
+                    return 'top'
+            return min(matched, key=self._CATEGORY_RANK.__getitem__)
         
-        # If type names didn't help, check the full description
-        for category, terms in category_mappings.items():
+        # If type names didn't help, check the full description. (A term found inside a
+        # single word is also found here, so no separate per-word pass is needed.)
+        for category, terms in self.CATEGORY_TERMS:
             if any(term in desc_lower for term in terms):
                 return category
-        
-        # Last resort: use word frequencies and context to guess
-        word_freq = Counter(desc_lower.split())
-        for category, terms in category_mappings.items():
-            for term in terms:
-                if any(term in word for word in word_freq):
-                    return category
                     
         return 'accessory'  # Default to accessory as it's the broadest category
     
@@ -602,20 +834,8 @@ class OutfitSuggester:
     def _extract_pattern(self, description: str) -> str:
         """Extract pattern information from a clothing description."""
         description = description.lower()
-        
-        patterns = {
-            'solid': ['solid', 'plain', 'basic', 'single color', 'one color'],
-            'striped': ['stripe', 'striped', 'stripes', 'pinstripe', 'vertical stripe', 'horizontal stripe'],
-            'plaid': ['plaid', 'tartan', 'check', 'checked', 'checkered', 'gingham'],
-            'floral': ['floral', 'flower', 'flowers', 'botanical', 'rose', 'daisy'],
-            'polka dot': ['polka dot', 'polka-dot', 'dots', 'spotted', 'dot pattern'],
-            'animal print': ['animal print', 'leopard', 'zebra', 'cheetah', 'snake', 'python', 'crocodile', 'tiger'],
-            'geometric': ['geometric', 'triangle', 'square', 'diamond pattern', 'hexagon', 'chevron', 'zigzag'],
-            'print': ['print', 'pattern', 'graphic', 'design', 'logo', 'motif'],
-            'colorblock': ['colorblock', 'color-block', 'color block', 'two-tone', 'two tone']
-        }
-        
-        for pattern_name, keywords in patterns.items():
+
+        for pattern_name, keywords in self.pattern_keywords.items():
             if any(keyword in description for keyword in keywords):
                 return pattern_name
                 
@@ -728,7 +948,7 @@ class OutfitSuggester:
         # Ensure score stays within 0-10 range
         return max(0, min(10, versatility_score))
     
-    def _calculate_color_coordination(self, item1_colors: List[str], item2_colors: List[str]) -> float:
+    def _calculate_color_coordination(self, item1_colors: frozenset, item2_colors: frozenset) -> float:
         """Calculate how well two items' colors coordinate (0-1 score)."""
         # If either item has no color data, default to neutral coordination
         if not item1_colors or not item2_colors:
@@ -737,30 +957,27 @@ class OutfitSuggester:
         coordination_score = 0.0
         
         # Check for direct color matches (monochromatic)
-        for color1 in item1_colors:
-            if color1 in item2_colors:
-                coordination_score += 0.8
-                break
+        if item1_colors & item2_colors:
+            coordination_score += 0.8
         
         # Check for complementary color pairs
-        for color1 in item1_colors:
-            if color1 in self.color_coordination['complementary']:
-                complementary_colors = self.color_coordination['complementary'][color1]
-                if any(color2 in complementary_colors for color2 in item2_colors):
-                    coordination_score += 0.9
-                    break
+        complementary = self.color_coordination['complementary']
+        if any(complementary[color1] & item2_colors for color1 in item1_colors if color1 in complementary):
+            coordination_score += 0.9
+            # Any two matches already saturate the score
+            if coordination_score >= 1.0:
+                return 1.0
         
         # Neutral colors go with anything
-        neutral_base = self.color_coordination['neutral_base']
-        if any(color in neutral_base for color in item1_colors) or any(color in neutral_base for color in item2_colors):
+        if item1_colors & self._neutral_set or item2_colors & self._neutral_set:
             coordination_score += 0.7
+            if coordination_score >= 1.0:
+                return 1.0
         
         # Check for monochromatic combinations (variations of the same color family)
-        for color_family in self.color_coordination['monochromatic']:
-            if (any(color in self.color_coordination['monochromatic'][color_family] for color in item1_colors) and
-                any(color in self.color_coordination['monochromatic'][color_family] for color in item2_colors)):
-                coordination_score += 0.8
-                break
+        if any(item1_colors & family and item2_colors & family
+               for family in self.color_coordination['monochromatic'].values()):
+            coordination_score += 0.8
         
         # Normalize score to 0-1 range
         return min(1.0, coordination_score)
@@ -972,35 +1189,8 @@ class OutfitSuggester:
                                          weather_categories: Dict[str, float]) -> float:
         """Calculate how appropriate an item is for the current weather with enhanced precision."""
         seasonality = item_features['seasonality']
-        
-        # Map weather categories to seasons more precisely
-        weather_season_map = {
-            'hot': {'summer': 0.8, 'spring': 0.2},
-            'cold': {'winter': 0.8, 'fall': 0.2},
-            'wet': {'fall': 0.4, 'spring': 0.4, 'winter': 0.2},
-            'windy': {'fall': 0.5, 'spring': 0.3, 'winter': 0.2},
-            'mild': {'spring': 0.5, 'fall': 0.3, 'summer': 0.2}
-        }
-        
-        # Material appropriateness for weather
-        material_weather_suitability = {
-            'hot': {
-                'good': ['cotton', 'linen', 'silk', 'rayon', 'chambray'],
-                'bad': ['wool', 'leather', 'fleece', 'velvet', 'cashmere']
-            },
-            'cold': {
-                'good': ['wool', 'cashmere', 'fleece', 'leather', 'down', 'fur', 'sherpa'],
-                'bad': ['linen', 'silk', 'mesh', 'chiffon']
-            },
-            'wet': {
-                'good': ['polyester', 'nylon', 'gore-tex', 'vinyl', 'leather', 'wool'],
-                'bad': ['suede', 'silk', 'cotton', 'velvet']
-            },
-            'windy': {
-                'good': ['leather', 'denim', 'wool', 'polyester', 'nylon'],
-                'bad': ['silk', 'light cotton', 'chiffon', 'loose weave']
-            }
-        }
+        weather_season_map = self.weather_season_map
+        material_weather_suitability = self.material_weather_suitability
         
         # Calculate appropriateness score
         weather_score = 0.0
@@ -1026,11 +1216,11 @@ class OutfitSuggester:
         # Pattern and type consideration for weather
         if weather_categories.get('wet', 0) > 0.5:
             # Patterns that show water stains less
-            if item_features['pattern'] in ['dark', 'patterned', 'print', 'plaid']:
+            if item_features['pattern'] in self.wet_weather_patterns:
                 weather_score += 0.1
             # Footwear that's good for wet weather
             if item_features['category'] == 'footwear' and any(term in ' '.join(item_features['type_names']) 
-                                                            for term in ['boots', 'waterproof', 'water-resistant']):
+                                                            for term in self.wet_weather_footwear):
                 weather_score += 0.2
         
         # Combine scores (with more weight on seasonality than materials)
@@ -1066,9 +1256,47 @@ class OutfitSuggester:
         # Bonus for perfect match
         if diff < 0.5:
             score = min(1.0, score + 0.2)
-            
+
         return score
 
+    def _calculate_weather_appropriateness_batch(self, arrays: Dict[str, Any],
+                                                 weather_categories: Dict[str, float]) -> np.ndarray:
+        """Vectorized _calculate_weather_appropriateness over the arrays from _load_items."""
+        weather_vec = np.array(
+            [weather_categories.get(weather_cat, 0.0) for weather_cat in self.weather_categories],
+            dtype=np.float32
+        )
+        return weather_scores(
+            arrays['seasonality'], weather_vec @ self._season_map,
+            arrays['material_mask'], self._good_material_masks, self._bad_material_masks,
+            weather_vec * np.float32(0.3), arrays['wet_bonus'],
+            weather_categories.get('wet', 0) > 0.5
+        )
+
+    def _calculate_formality_match_batch(self, arrays: Dict[str, Any], occasion_formality: float) -> np.ndarray:
+        """Vectorized _calculate_formality_match over the arrays from _load_items."""
+        return formality_scores(arrays['formality'], occasion_formality)
+
+    def _calculate_overall_scores(self, arrays: Dict[str, Any], weather_categories: Dict[str, float],
+                                  occasion_formality: float) -> np.ndarray:
+        """Combined weather and formality score for every item in arrays."""
+        if _score_all_parallel is not None and len(arrays['items']) >= self.PARALLEL_SCORING_THRESHOLD:
+            weather_vec = np.array(
+                [weather_categories.get(weather_cat, 0.0) for weather_cat in self.weather_categories],
+                dtype=np.float32
+            )
+            return _score_all_parallel(
+                arrays['seasonality'], weather_vec @ self._season_map,
+                arrays['material_mask'], self._good_material_masks, self._bad_material_masks,
+                weather_vec * np.float32(0.3), arrays['wet_bonus'],
+                weather_categories.get('wet', 0) > 0.5,
+                arrays['formality'], float(occasion_formality)
+            )
+
+        weather_score = self._calculate_weather_appropriateness_batch(arrays, weather_categories)
+        formality_score = self._calculate_formality_match_batch(arrays, occasion_formality)
+        return weather_score * 0.4 + formality_score * 0.6
+
     def _find_complementary_items(self, selected_item, all_items, category):
         """Find items that complement the selected item in terms of style and color."""
         complementary_items = []
@@ -1077,8 +1305,8 @@ class OutfitSuggester:
             if item['category'] == category:
                 # Calculate color coordination score
                 color_score = self._calculate_color_coordination(
-                    selected_item['color_names'], 
-                    item['color_names']
+                    selected_item['color_set'], 
+                    item['color_set']
                 )
                 
                 # Get style compatibility
@@ -1100,21 +1328,98 @@ class OutfitSuggester:
         
         return complementary_items
     
-    def process_clothing_items(self, clothing_descriptions: List[str]) -> pd.DataFrame:
-        """Process clothing descriptions into a feature dataframe with enhanced features."""
-        items_features = []
-        
-        for description in clothing_descriptions:
-            features = self._extract_features_from_description(description)
-            items_features.append(features)
-        
-        return pd.DataFrame(items_features)
-    
+    def _load_items(self, clothing_descriptions: List[str]) -> Dict[str, Any]:
+        """Build the columnar float32 item arrays (one contiguous array per attribute).
+
+        The arrays are returned rather than kept on self: one suggester instance
+        serves concurrent requests, so nothing per-call may live on it.
+        """
+        n_items = len(clothing_descriptions)
+        n_numerical = (len(self._get_color_list()) + len(self._get_material_list()) +
+                       len(self._get_clothing_types()) + 2 + len(self.SEASONS))
+
+        items = []
+        formality = np.empty(n_items, dtype=np.float32)
+        versatility = np.empty(n_items, dtype=np.float32)
+        seasonality = np.empty((n_items, len(self.SEASONS)), dtype=np.float32)
+        numerical_features = np.empty((n_items, n_numerical), dtype=np.float32)
+        color_mask = np.zeros(n_items, dtype=np.uint64)
+        material_mask = np.zeros(n_items, dtype=np.uint64)
+        type_hits = np.zeros((n_items, len(self._get_clothing_types())), dtype=bool)
+        pattern_code = np.empty(n_items, dtype=np.int8)
+        category_code = np.empty(n_items, dtype=np.int8)
+        style_profile_vec = np.empty((n_items, len(self.style_profiles)), dtype=np.float32)
+
+        for i, description in enumerate(clothing_descriptions):
+            features = self._get_item_features(description)
+            items.append(features)
+
+            formality[i] = features['formality']
+            versatility[i] = features['versatility']
+            seasonality[i] = [features['seasonality'][season] for season in self.SEASONS]
+            numerical_features[i] = features['numerical_features']
+            color_mask[i] = sum(self._color_bits[color] for color in features['color_names'])
+            material_mask[i] = sum(self._material_bits[material] for material in features['material_names'])
+            type_hits[i] = features['type_features'] > 0
+            pattern_code[i] = self._pattern_codes[features['pattern']]
+            category_code[i] = self._category_codes[features['category']]
+            style_profile_vec[i] = list(features['style_profile'].values())
+
+        # Bonus applied in wet weather: stain-hiding patterns and wet-weather footwear
+        wet_footwear = type_hits[:, self._wet_footwear_types].any(axis=1)
+        wet_bonus = (
+            0.1 * np.isin(pattern_code, self._wet_pattern_codes) +
+            0.2 * ((category_code == self._category_codes['footwear']) & wet_footwear)
+        ).astype(np.float32)
+
+        return {
+            'items': items,
+            'formality': formality,
+            'versatility': versatility,
+            'seasonality': seasonality,
+            'numerical_features': numerical_features,
+            'color_mask': color_mask,
+            'material_mask': material_mask,
+            'type_hits': type_hits,
+            'pattern_code': pattern_code,
+            'category_code': category_code,
+            'style_profile_vec': style_profile_vec,
+            'wet_bonus': wet_bonus,
+        }
+
+    def process_clothing_items(self, clothing_descriptions: List[str]) -> Union[np.ndarray, pd.DataFrame]:
+        """Process clothing descriptions into a structured array of item features.
+
+        Returns a pandas DataFrame of the full feature dicts instead when
+        return_dataframe is set.
+        """
+        arrays = self._load_items(clothing_descriptions)
+
+        if self.return_dataframe:
+            return pd.DataFrame(arrays['items'])
+
+        items = np.empty(len(arrays['items']), dtype=self.ITEM_DTYPE)
+        items['description'] = [features['description'] for features in arrays['items']]
+        items['category'] = [features['category'] for features in arrays['items']]
+        items['formality'] = arrays['formality']
+        items['versatility'] = arrays['versatility']
+        items['seasonality'] = arrays['seasonality']
+        items['pattern'] = arrays['pattern_code']
+        return items
+
+    def _best_item_index(self, arrays: Dict[str, Any], category: str, overall_score: np.ndarray):
+        """Return the index of the highest-scoring item in a category, or None."""
+        indices = np.flatnonzero(arrays['category_code'] == self._category_codes[category])
+        if indices.size == 0:
+            return None
+        return indices[np.argmax(overall_score[indices])]
+
     def suggest_outfit(self, clothing_descriptions: List[str], occasion: str, 
                       weather_description: str, temperature: float) -> Dict[str, str]:
         """Suggest an outfit based on occasion and weather."""
         # Process clothing items
-        clothing_df = self.process_clothing_items(clothing_descriptions)
+        arrays = self._load_items(clothing_descriptions)
+        items = arrays['items']
         
         # Categorize weather with enhanced precision
         weather_categories = self._categorize_weather(weather_description, temperature)
@@ -1125,21 +1430,8 @@ class OutfitSuggester:
         # Prepare to track item features for coordination
         selected_items_features = {}
         
-        # Calculate scores for each item using enhanced ML approach
-        clothing_df['weather_score'] = clothing_df.apply(
-            lambda row: self._calculate_weather_appropriateness(row, weather_categories), axis=1
-        )
-        
-        clothing_df['formality_score'] = clothing_df.apply(
-            lambda row: self._calculate_formality_match(row['formality'], occasion_features['formality']), axis=1
-        )
-        
-        # Calculate overall score (combine weather and formality scores)
-        clothing_df['overall_score'] = (clothing_df['weather_score'] * 0.4 + 
-                                      clothing_df['formality_score'] * 0.6)
-        
-        # Sort by overall score within each category
-        clothing_df = clothing_df.sort_values(['category', 'overall_score'], ascending=[True, False])
+        # Calculate overall score for each item (combine weather and formality scores)
+        overall_score = self._calculate_overall_scores(arrays, weather_categories, occasion_features['formality'])
         
         # Select the best item from each required category
         outfit = {}
@@ -1147,37 +1439,36 @@ class OutfitSuggester:
         optional_categories = ['outerwear', 'accessory']
         
         # First, handle one-piece items (dresses, jumpsuits) specially
-        one_piece_items = clothing_df[clothing_df['category'] == 'one_piece']
-        if not one_piece_items.empty and one_piece_items.iloc[0]['overall_score'] > 0.7:
+        best = self._best_item_index(arrays, 'one_piece', overall_score)
+        if best is not None and overall_score[best] > 0.7:
             # If we have a good one-piece item, use it instead of separate top and bottom
-            outfit['one_piece'] = one_piece_items.iloc[0]['description']
-            selected_items_features['one_piece'] = one_piece_items.iloc[0].to_dict()
+            outfit['one_piece'] = items[best]['description']
+            selected_items_features['one_piece'] = items[best]
             
             # Remove top and bottom from required categories
             required_categories = [cat for cat in required_categories if cat not in ['top', 'bottom']]
         
         # Next, select required items
         for category in required_categories:
-            category_items = clothing_df[clothing_df['category'] == category]
-            if not category_items.empty:
-                best_item = category_items.iloc[0]
-                outfit[category] = best_item['description']
-                selected_items_features[category] = best_item.to_dict()
+            best = self._best_item_index(arrays, category, overall_score)
+            if best is not None:
+                outfit[category] = items[best]['description']
+                selected_items_features[category] = items[best]
             else:
                 outfit[category] = f"No suitable {category} found"
         
         # Then, select optional items if they have good scores
         for category in optional_categories:
-            category_items = clothing_df[clothing_df['category'] == category]
-            if not category_items.empty and category_items.iloc[0]['overall_score'] > 0.6:
+            best = self._best_item_index(arrays, category, overall_score)
+            if best is not None and overall_score[best] > 0.6:
                 # For outerwear, check if temperature actually warrants it
                 if category == 'outerwear':
                     if temperature < 20 or weather_categories.get('wet', 0) > 0.4 or weather_categories.get('windy', 0) > 0.4:
-                        outfit[category] = category_items.iloc[0]['description']
-                        selected_items_features[category] = category_items.iloc[0].to_dict()
+                        outfit[category] = items[best]['description']
+                        selected_items_features[category] = items[best]
                 else:
-                    outfit[category] = category_items.iloc[0]['description']
-                    selected_items_features[category] = category_items.iloc[0].to_dict()
+                    outfit[category] = items[best]['description']
+                    selected_items_features[category] = items[best]
         
         return outfit
 
@@ -1,279 +1,359 @@
-import requests
+import asyncio
+import aiohttp
+import gzip
+import orjson
 import time
-import random
+import numpy as np
+from itertools import islice
+from tqdm import tqdm
 
 # Configuration
-API_URL = "http://localhost:8000/upload-clothing/description"
+BASE_URL = "http://localhost:8000"
+API_URL = f"{BASE_URL}/upload-clothing/bulk"
 USER_ID = "test-user-91f1b146" # put a valid userId that is already in the users table
+MAX_CONCURRENCY = 16  # upper bound on in-flight uploads; the limiter adapts below this
+BATCH_SIZE = 50  # descriptions per bulk request
 
-# Get vocabulary lists directly from the ML model
-def get_color_list():
-    """Return the list of common clothing colors the ML model looks for."""
-    return [
-        'red', 'blue', 'green', 'yellow', 'black', 'white', 'grey', 'gray',
-        'purple', 'pink', 'orange', 'brown', 'navy', 'beige', 'cream', 'tan',
-        'olive', 'burgundy', 'charcoal', 'silver', 'gold', 'teal', 'khaki',
-        'maroon', 'mustard', 'coral', 'mint', 'turquoise', 'indigo', 'magenta',
-        'lavender', 'peach', 'rust', 'emerald', 'ochre', 'crimson', 'azure',
-        'lilac', 'amber', 'salmon', 'slate', 'mauve', 'taupe', 'cerulean',
-        'ivory', 'camel', 'sage', 'periwinkle', 'plum', 'cobalt', 'fuchsia'
-    ]
+# Vocabulary taken directly from the ML model, built once at import
 
-def get_material_list():
-    """Return the list of common clothing materials the ML model looks for."""
-    return [
-        'cotton', 'wool', 'leather', 'denim', 'silk', 'linen', 'polyester',
-        'nylon', 'cashmere', 'velvet', 'suede', 'corduroy', 'fleece', 'tweed',
-        'jersey', 'canvas', 'chino', 'flannel', 'chenille', 'satin', 'viscose',
-        'spandex', 'rayon', 'acrylic', 'lyocell', 'mohair', 'merino', 'angora',
-        'modal', 'twill', 'chambray', 'terry', 'mesh', 'sequin', 'bamboo',
-        'microfiber', 'gabardine', 'herringbone', 'poplin', 'organza', 'taffeta',
-        'fur', 'faux fur', 'sherpa', 'crepe', 'lamé', 'oxford', 'gore-tex'
-    ]
+# Common clothing colors the ML model looks for.
+COLORS = (
+    'red', 'blue', 'green', 'yellow', 'black', 'white', 'grey', 'gray',
+    'purple', 'pink', 'orange', 'brown', 'navy', 'beige', 'cream', 'tan',
+    'olive', 'burgundy', 'charcoal', 'silver', 'gold', 'teal', 'khaki',
+    'maroon', 'mustard', 'coral', 'mint', 'turquoise', 'indigo', 'magenta',
+    'lavender', 'peach', 'rust', 'emerald', 'ochre', 'crimson', 'azure',
+    'lilac', 'amber', 'salmon', 'slate', 'mauve', 'taupe', 'cerulean',
+    'ivory', 'camel', 'sage', 'periwinkle', 'plum', 'cobalt', 'fuchsia'
+)
 
-def get_top_types():
-    """Return clothing type terms for tops that the ML model recognizes."""
-    return [
-        't-shirt', 'shirt', 'blouse', 'sweater', 'sweatshirt', 'hoodie', 
-        'polo', 'tank', 'turtleneck', 'tunic', 'button-down',
-        'henley', 'crop top', 'camisole', 'pullover', 'jersey', 'long sleeve',
-        'short sleeve', 'v-neck', 'crew neck', 'sleeveless', 'top', 'cardigan'
-    ]
+# Common clothing materials the ML model looks for.
+MATERIALS = (
+    'cotton', 'wool', 'leather', 'denim', 'silk', 'linen', 'polyester',
+    'nylon', 'cashmere', 'velvet', 'suede', 'corduroy', 'fleece', 'tweed',
+    'jersey', 'canvas', 'chino', 'flannel', 'chenille', 'satin', 'viscose',
+    'spandex', 'rayon', 'acrylic', 'lyocell', 'mohair', 'merino', 'angora',
+    'modal', 'twill', 'chambray', 'terry', 'mesh', 'sequin', 'bamboo',
+    'microfiber', 'gabardine', 'herringbone', 'poplin', 'organza', 'taffeta',
+    'fur', 'faux fur', 'sherpa', 'crepe', 'lamé', 'oxford', 'gore-tex'
+)
 
-def get_bottom_types():
-    """Return clothing type terms for bottoms that the ML model recognizes."""
-    return [
-        'jeans', 'pants', 'trousers', 'shorts', 'skirt', 'chinos', 'leggings',
-        'joggers', 'sweatpants', 'culottes', 'capris', 'jeggings', 'cargo',
-        'khakis', 'slacks', 'dress pants', 'bermudas', 'palazzo', 'linen pants'
-    ]
+# Clothing type terms for tops that the ML model recognizes.
+TOP_TYPES = (
+    't-shirt', 'shirt', 'blouse', 'sweater', 'sweatshirt', 'hoodie', 
+    'polo', 'tank', 'turtleneck', 'tunic', 'button-down',
+    'henley', 'crop top', 'camisole', 'pullover', 'jersey', 'long sleeve',
+    'short sleeve', 'v-neck', 'crew neck', 'sleeveless', 'top', 'cardigan'
+)
 
-def get_onepiece_types():
-    """Return clothing type terms for one-piece items that the ML model recognizes."""
-    return [
-        'dress', 'jumpsuit', 'romper', 'playsuit', 'gown', 'sundress', 'maxi',
-        'midi', 'mini', 'shift', 'sheath', 'a-line', 'wrap', 'slip dress'
-    ]
+# Clothing type terms for bottoms that the ML model recognizes.
+BOTTOM_TYPES = (
+    'jeans', 'pants', 'trousers', 'shorts', 'skirt', 'chinos', 'leggings',
+    'joggers', 'sweatpants', 'culottes', 'capris', 'jeggings', 'cargo',
+    'khakis', 'slacks', 'dress pants', 'bermudas', 'palazzo', 'linen pants'
+)
 
-def get_outerwear_types():
-    """Return clothing type terms for outerwear that the ML model recognizes."""
-    return [
-        'jacket', 'coat', 'blazer', 'parka', 'windbreaker', 'vest', 
-        'trench', 'bomber', 'denim jacket', 'leather jacket', 'puffer', 'raincoat',
-        'poncho', 'peacoat', 'overcoat', 'anorak', 'cape', 'shrug'
-    ]
+# Clothing type terms for one-piece items that the ML model recognizes.
+ONEPIECE_TYPES = (
+    'dress', 'jumpsuit', 'romper', 'playsuit', 'gown', 'sundress', 'maxi',
+    'midi', 'mini', 'shift', 'sheath', 'a-line', 'wrap', 'slip dress'
+)
 
-def get_footwear_types():
-    """Return clothing type terms for footwear that the ML model recognizes."""
-    return [
-        'shoes', 'boots', 'sneakers', 'sandals', 'loafers', 'flats', 'heels',
-        'pumps', 'wedges', 'oxford shoes', 'slippers', 'mules', 'espadrilles',
-        'mocassins', 'brogues', 'ankle boots', 'hiking boots', 'slip-ons'
-    ]
+# Clothing type terms for outerwear that the ML model recognizes.
+OUTERWEAR_TYPES = (
+    'jacket', 'coat', 'blazer', 'parka', 'windbreaker', 'vest', 
+    'trench', 'bomber', 'denim jacket', 'leather jacket', 'puffer', 'raincoat',
+    'poncho', 'peacoat', 'overcoat', 'anorak', 'cape', 'shrug'
+)
 
-def get_accessory_types():
-    """Return clothing type terms for accessories that the ML model recognizes."""
-    return [
-        'watch', 'scarf', 'tie', 'belt', 'hat', 'gloves', 'socks', 'necklace',
-        'earrings', 'bracelet', 'ring', 'sunglasses', 'bag', 'purse', 'handbag',
-        'wallet', 'backpack', 'tote', 'clutch', 'headband', 'beanie', 'cap',
-        'beret', 'bowtie', 'pocket square', 'cufflinks', 'anklet', 'brooch'
-    ]
+# Clothing type terms for footwear that the ML model recognizes.
+FOOTWEAR_TYPES = (
+    'shoes', 'boots', 'sneakers', 'sandals', 'loafers', 'flats', 'heels',
+    'pumps', 'wedges', 'oxford shoes', 'slippers', 'mules', 'espadrilles',
+    'mocassins', 'brogues', 'ankle boots', 'hiking boots', 'slip-ons'
+)
 
-def get_patterns():
-    """Return patterns that the ML model recognizes."""
-    return [
-        'solid', 'striped', 'plaid', 'floral', 'polka dot', 'animal print',
-        'geometric', 'print', 'colorblock', 'check', 'checked', 'tartan',
-        'herringbone', 'paisley', 'chevron', 'pinstripe', 'gingham'
-    ]
+# Clothing type terms for accessories that the ML model recognizes.
+ACCESSORY_TYPES = (
+    'watch', 'scarf', 'tie', 'belt', 'hat', 'gloves', 'socks', 'necklace',
+    'earrings', 'bracelet', 'ring', 'sunglasses', 'bag', 'purse', 'handbag',
+    'wallet', 'backpack', 'tote', 'clutch', 'headband', 'beanie', 'cap',
+    'beret', 'bowtie', 'pocket square', 'cufflinks', 'anklet', 'brooch'
+)
 
-def get_fits():
-    """Return fit descriptions that the ML model recognizes."""
-    return [
-        'slim', 'fitted', 'tailored', 'skinny', 'tight', 'form-fitting',
-        'regular', 'classic', 'standard', 'straight', 'normal',
-        'loose', 'relaxed', 'oversized', 'baggy', 'wide', 'boxy'
-    ]
+# Patterns that the ML model recognizes.
+PATTERNS = (
+    'solid', 'striped', 'plaid', 'floral', 'polka dot', 'animal print',
+    'geometric', 'print', 'colorblock', 'check', 'checked', 'tartan',
+    'herringbone', 'paisley', 'chevron', 'pinstripe', 'gingham'
+)
 
-def get_formality_terms():
-    """Return formality-related terms that the ML model recognizes."""
-    return {
-        'casual': ['casual', 'relaxed', 'everyday', 'laid back', 'easygoing', 'comfortable', 'lounging', 'weekend', 'home', 'errands'],
-        'business': ['business', 'work', 'office', 'professional', 'business casual', 'interview', 'presentation', 'networking', 'conference'],
-        'formal': ['formal', 'elegant', 'sophisticated', 'dressy', 'wedding', 'black tie', 'ceremony', 'cocktail', 'dinner', 'graduation']
-    }
+# Fit descriptions that the ML model recognizes.
+FITS = (
+    'slim', 'fitted', 'tailored', 'skinny', 'tight', 'form-fitting',
+    'regular', 'classic', 'standard', 'straight', 'normal',
+    'loose', 'relaxed', 'oversized', 'baggy', 'wide', 'boxy'
+)
 
-def get_seasonality_terms():
-    """Return seasonality-related terms that the ML model recognizes."""
-    return {
-        'summer': ['summer', 'hot', 'warm', 'lightweight', 'breathable', 'cooling', 'airy', 'tropical'],
-        'winter': ['winter', 'cold', 'freezing', 'warm', 'insulated', 'heavy', 'thick', 'cozy', 'thermal'],
-        'spring': ['spring', 'light', 'rain-resistant', 'transitional', 'mild'],
-        'fall': ['fall', 'autumn', 'layering', 'mid-weight', 'moderate']
-    }
+# Formality-related terms that the ML model recognizes.
+FORMALITY_TERMS = {
+    'casual': ('casual', 'relaxed', 'everyday', 'laid back', 'easygoing', 'comfortable', 'lounging', 'weekend', 'home', 'errands'),
+    'business': ('business', 'work', 'office', 'professional', 'business casual', 'interview', 'presentation', 'networking', 'conference'),
+    'formal': ('formal', 'elegant', 'sophisticated', 'dressy', 'wedding', 'black tie', 'ceremony', 'cocktail', 'dinner', 'graduation')
+}
 
-def get_style_terms():
-    """Return style profile terms that the ML model recognizes."""
-    return {
-        'casual': ['relaxed', 'comfortable', 'casual', 'laid back', 'easygoing'],
-        'formal': ['elegant', 'sophisticated', 'formal', 'dressy', 'polished'],
-        'business': ['professional', 'business', 'office', 'work', 'corporate'],
-        'sporty': ['athletic', 'sporty', 'active', 'workout', 'gym'],
-        'bohemian': ['boho', 'bohemian', 'artistic', 'free-spirited', 'earthy'],
-        'vintage': ['retro', 'vintage', 'classic', 'old-fashioned', 'timeless'],
-        'preppy': ['preppy', 'clean-cut', 'collegiate', 'traditional', 'nautical'],
-        'streetwear': ['urban', 'street', 'trendy', 'hip', 'skater'],
-        'minimalist': ['minimal', 'simple', 'clean', 'basic', 'understated']
-    }
+# Seasonality-related terms that the ML model recognizes.
+SEASONALITY_TERMS = {
+    'summer': ('summer', 'hot', 'warm', 'lightweight', 'breathable', 'cooling', 'airy', 'tropical'),
+    'winter': ('winter', 'cold', 'freezing', 'warm', 'insulated', 'heavy', 'thick', 'cozy', 'thermal'),
+    'spring': ('spring', 'light', 'rain-resistant', 'transitional', 'mild'),
+    'fall': ('fall', 'autumn', 'layering', 'mid-weight', 'moderate')
+}
 
-# Generate clothing descriptions directly based on the ML model's vocabulary
-def generate_clothing_items(count=300):
-    """Generate clothing descriptions using terms the ML model recognizes."""
-    items = []
+# Style profile terms that the ML model recognizes.
+STYLE_TERMS = {
+    'casual': ('relaxed', 'comfortable', 'casual', 'laid back', 'easygoing'),
+    'formal': ('elegant', 'sophisticated', 'formal', 'dressy', 'polished'),
+    'business': ('professional', 'business', 'office', 'work', 'corporate'),
+    'sporty': ('athletic', 'sporty', 'active', 'workout', 'gym'),
+    'bohemian': ('boho', 'bohemian', 'artistic', 'free-spirited', 'earthy'),
+    'vintage': ('retro', 'vintage', 'classic', 'old-fashioned', 'timeless'),
+    'preppy': ('preppy', 'clean-cut', 'collegiate', 'traditional', 'nautical'),
+    'streetwear': ('urban', 'street', 'trendy', 'hip', 'skater'),
+    'minimalist': ('minimal', 'simple', 'clean', 'basic', 'understated')
+}
+
+# Flattened term pools for sampling
+ALL_FORMALITY = tuple(term for terms in FORMALITY_TERMS.values() for term in terms)
+ALL_SEASONALITY = tuple(term for terms in SEASONALITY_TERMS.values() for term in terms)
+ALL_STYLES = tuple(term for terms in STYLE_TERMS.values() for term in terms)
+
+# Probability of including material, fit, pattern, formality, seasonality and style
+OPTIONAL_PART_RATES = np.array([0.9, 0.7, 0.5, 0.4, 0.3, 0.2])
+
+# Category distribution (percentage of wardrobe)
+CATEGORY_WEIGHTS = (
+    ('top', 30),
+    ('bottom', 20),
+    ('one_piece', 10),
+    ('outerwear', 15),
+    ('footwear', 15),
+    ('accessory', 10)
+)
+
+# Resample a duplicate description at most this many times before keeping it
+MAX_DEDUPE_RETRIES = 10
+
+def sample_terms(rng, category_types, n):
+    """Draw term indices and optional-part flags for n items in one NumPy pass."""
+    # Index columns: color, type, material, fit, pattern, formality, seasonality, style
+    sizes = [len(COLORS), len(category_types), len(MATERIALS), len(FITS), len(PATTERNS),
+             len(ALL_FORMALITY), len(ALL_SEASONALITY), len(ALL_STYLES)]
+    terms = rng.integers(0, sizes, (n, len(sizes))).tolist()
+    include = (rng.random((n, len(OPTIONAL_PART_RATES))) < OPTIONAL_PART_RATES).tolist()
+    return terms, include
+
+def build_description(category_types, terms, include):
+    """Assemble one description from sampled term indices and optional-part flags."""
+    color, item_type, material, fit, pattern, formality, seasonality, style = terms
+    has_material, has_fit, has_pattern, has_formality, has_seasonality, has_style = include
     
-    # Get all the vocabulary lists
-    colors = get_color_list()
-    materials = get_material_list()
-    patterns = get_patterns()
-    fits = get_fits()
+    # Space-separated words, then comma-separated trailing clauses
+    parts = []
+    suffix_parts = []
     
-    formality_terms = get_formality_terms()
-    all_formality = [term for terms in formality_terms.values() for term in terms]
+    # Add fit description sometimes (70%)
+    if has_fit:
+        parts.append(FITS[fit])
     
-    seasonality_terms = get_seasonality_terms()
-    all_seasonality = [term for terms in seasonality_terms.values() for term in terms]
+    # Always include color and type; include material most of the time (90%)
+    parts.append(COLORS[color])
+    if has_material:
+        parts.append(MATERIALS[material])
+    parts.append(category_types[item_type])
     
-    style_terms = get_style_terms()
-    all_styles = [term for terms in style_terms.values() for term in terms]
+    # Add pattern sometimes (50%)
+    if has_pattern:
+        parts.append(f"with {PATTERNS[pattern]} pattern")
     
-    # Category distribution (approximate percentage of wardrobe)
-    category_distribution = {
-        'top': 0.30,       # 30%
-        'bottom': 0.20,    # 20%
-        'one_piece': 0.10, # 10%
-        'outerwear': 0.15, # 15%
-        'footwear': 0.15,  # 15%
-        'accessory': 0.10  # 10%
-    }
+    # Add formality sometimes (40%)
+    if has_formality:
+        parts.append(f"for {ALL_FORMALITY[formality]} occasions")
     
-    # Calculate how many items per category
-    items_per_category = {
-        category: int(count * percentage)
-        for category, percentage in category_distribution.items()
-    }
+    # Add seasonality sometimes (30%)
+    if has_seasonality:
+        suffix_parts.append(f"{ALL_SEASONALITY[seasonality]} weather")
     
-    # Adjust to ensure we get exactly the requested count
-    total = sum(items_per_category.values())
-    if total < count:
-        items_per_category['top'] += count - total
+    # Add style sometimes (20%)
+    if has_style:
+        suffix_parts.append(f"{ALL_STYLES[style]} style")
+    
+    description = " ".join(parts)
+    if suffix_parts:
+        description += ", " + ", ".join(suffix_parts)
+    return description
+
+# Generate clothing descriptions directly based on the ML model's vocabulary
+def generate_clothing_items(count=300, rng=None):
+    """Generate clothing descriptions using terms the ML model recognizes."""
+    rng = rng if rng is not None else np.random.default_rng()
+    items = []
+    
+    # Exact integer split of count by percentage; the leftover goes one item
+    # per category, heaviest categories first
+    items_per_category = {}
+    for category, weight in CATEGORY_WEIGHTS:
+        items_per_category[category], _ = divmod(count * weight, 100)
+    leftover = count - sum(items_per_category.values())
+    for category, _ in sorted(CATEGORY_WEIGHTS, key=lambda cw: -cw[1])[:leftover]:
+        items_per_category[category] += 1
     
     # Type lists by category
     type_by_category = {
-        'top': get_top_types(),
-        'bottom': get_bottom_types(),
-        'one_piece': get_onepiece_types(),
-        'outerwear': get_outerwear_types(),
-        'footwear': get_footwear_types(),
-        'accessory': get_accessory_types()
+        'top': TOP_TYPES,
+        'bottom': BOTTOM_TYPES,
+        'one_piece': ONEPIECE_TYPES,
+        'outerwear': OUTERWEAR_TYPES,
+        'footwear': FOOTWEAR_TYPES,
+        'accessory': ACCESSORY_TYPES
     }
     
-    # Generate items for each category
+    # Generate items for each category, sampling every term for the category in one pass
+    seen = set()
     for category, num_items in items_per_category.items():
         category_types = type_by_category[category]
+        terms, include = sample_terms(rng, category_types, num_items)
         
-        for _ in range(num_items):
-            # Always include color and type
-            color = random.choice(colors)
-            item_type = random.choice(category_types)
-            
-            # Include material most of the time (90%)
-            if random.random() < 0.9:
-                material = random.choice(materials)
-                description = f"{color} {material} {item_type}"
-            else:
-                description = f"{color} {item_type}"
-            
-            # Add fit description sometimes (70%)
-            if random.random() < 0.7:
-                fit = random.choice(fits)
-                description = f"{fit} {description}"
+        for i in range(num_items):
+            description = build_description(category_types, terms[i], include[i])
             
-            # Add pattern sometimes (50%)
-            if random.random() < 0.5:
-                pattern = random.choice(patterns)
-                description += f" with {pattern} pattern"
-            
-            # Add formality sometimes (40%)
-            if random.random() < 0.4:
-                formality = random.choice(all_formality)
-                description += f" for {formality} occasions"
-            
-            # Add seasonality sometimes (30%)
-            if random.random() < 0.3:
-                seasonality = random.choice(all_seasonality)
-                description += f", {seasonality} weather"
-            
-            # Add style sometimes (20%)
-            if random.random() < 0.2:
-                style = random.choice(all_styles)
-                description += f", {style} style"
+            # Resample duplicates so the server doesn't process the same item twice
+            retries = 0
+            while description in seen and retries < MAX_DEDUPE_RETRIES:
+                retry_terms, retry_include = sample_terms(rng, category_types, 1)
+                description = build_description(category_types, retry_terms[0], retry_include[0])
+                retries += 1
+            seen.add(description)
             
             items.append((description, category))
     
     # Shuffle the items for a more natural distribution
-    random.shuffle(items)
+    rng.shuffle(items)
     return items
 
-# Function to add a clothing item
-def add_clothing_item(description):
+# Split items into lists of at most `size`
+def chunked(items, size):
+    iterator = iter(items)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+# Concurrency limiter that adapts to the server (additive increase, multiplicative decrease)
+class AdaptiveLimiter:
+    def __init__(self, max_limit, initial_limit=4):
+        self.max_limit = max_limit
+        self.limit = min(initial_limit, max_limit)
+        self.in_flight = 0
+        self.latency_ewma = None
+        self._condition = asyncio.Condition()
+    
+    async def __aenter__(self):
+        async with self._condition:
+            await self._condition.wait_for(lambda: self.in_flight < self.limit)
+            self.in_flight += 1
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        async with self._condition:
+            self.in_flight -= 1
+            self._condition.notify_all()
+    
+    def record(self, ok, latency):
+        """Grow the limit by one on success, halve it on a server error or failure."""
+        if self.latency_ewma is None:
+            self.latency_ewma = latency
+        else:
+            self.latency_ewma = 0.8 * self.latency_ewma + 0.2 * latency
+        
+        if ok:
+            self.limit = min(self.max_limit, self.limit + 1)
+        else:
+            self.limit = max(1, self.limit // 2)
+
+# Open pooled connections ahead of the upload burst so the first batches skip the handshake
+async def warm_up(session, connections):
+    async def ping():
+        try:
+            async with session.get(f"{BASE_URL}/", timeout=aiohttp.ClientTimeout(total=5)) as response:
+                await response.read()
+        except Exception:
+            pass
+    
+    await asyncio.gather(*[ping() for _ in range(connections)])
+
+# Function to add a batch of clothing items in one request
+async def add_clothing_items(session, limiter, descriptions):
     payload = {
         "userId": USER_ID,
-        "description": description
+        "descriptions": descriptions
     }
+    # Batches of repetitive descriptions compress well
+    body = gzip.compress(orjson.dumps(payload))
+    headers = {"Content-Encoding": "gzip", "Content-Type": "application/json"}
     
-    try:
-        response = requests.post(API_URL, json=payload)
-        return response.json()
-    except Exception as e:
-        return {"error": str(e)}
+    async with limiter:
+        start = time.perf_counter()
+        try:
+            async with session.post(API_URL, data=body, headers=headers) as response:
+                limiter.record(response.status < 500, time.perf_counter() - start)
+                if response.status >= 400:
+                    return {"error": f"HTTP {response.status}: {await response.text()}"}
+                return await response.json()
+        except Exception as e:
+            limiter.record(False, time.perf_counter() - start)
+            return {"error": str(e)}
 
 # Main execution
-def main():
+async def main():
     total_items = 300
     print(f"Generating {total_items} clothing items using ML model vocabulary...")
     
     clothing_items = generate_clothing_items(total_items)
+    batches = list(chunked(clothing_items, BATCH_SIZE))
     
-    print(f"Adding {len(clothing_items)} clothing items to the database for user {USER_ID}...")
+    print(f"Adding {len(clothing_items)} clothing items to the database for user {USER_ID} "
+          f"in {len(batches)} batches...")
     
     success_count = 0
     error_count = 0
     
-    for i, (item, category) in enumerate(clothing_items, 1):
-        try:
-            # Print progress
-            print(f"[{i}/{len(clothing_items)}] Adding {category}: {item}")
-            
-            result = add_clothing_item(item)
-            
-            if "error" in result:
-                print(f"  Error: {result['error']}")
-                error_count += 1
-            else:
-                success_count += 1
-            
-            # Small delay to prevent overwhelming the server
-            time.sleep(0.2)
-            
-        except Exception as e:
-            print(f"  Exception: {str(e)}")
-            error_count += 1
+    # One pooled keep-alive session shared by every upload
+    limiter = AdaptiveLimiter(MAX_CONCURRENCY)
+    connector = aiohttp.TCPConnector(limit=32, keepalive_timeout=75)
+    timeout = aiohttp.ClientTimeout(total=30)
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+        await warm_up(session, limiter.limit)
+        
+        async def upload(batch):
+            return batch, await add_clothing_items(session, limiter, [item for item, _ in batch])
+        
+        # Progress bar counts items; only failures are printed
+        with tqdm(total=len(clothing_items), unit="item") as progress:
+            for next_done in asyncio.as_completed([upload(batch) for batch in batches]):
+                batch, result = await next_done
+                
+                if "error" in result:
+                    tqdm.write(f"  Error: {result['error']}")
+                    error_count += len(batch)
+                else:
+                    success_count += result["result"]["count"]
+                progress.update(len(batch))
     
     print(f"\nSummary:")
     print(f"Successfully added: {success_count} items")
     print(f"Failed to add: {error_count} items")
     print(f"Total: {len(clothing_items)} items")
+    if limiter.latency_ewma is not None:
+        print(f"Final concurrency limit: {limiter.limit} (avg latency {limiter.latency_ewma * 1000:.0f} ms)")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    asyncio.run(main())
\ No newline at end of file
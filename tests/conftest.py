@@ -0,0 +1,8 @@
+# tests/conftest.py
+import os
+import sys
+
+# Make the app, ml and utils packages importable from the tests, once per session
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.append(ROOT_DIR)
@@ -1,24 +1,51 @@
+import io
 import os
 import uuid
-import time
+import sqlite3
 import pytest
 from unittest.mock import patch, MagicMock
 from fastapi import HTTPException
 
-import sys
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from utils.clothing_utils import add_clothing_item, get_all_clothing_descriptions
-from utils.db_utils import get_db_connection, create_users_table, create_clothing_table
+from utils import clothing_utils
+from utils.clothing_utils import (
+    SQL_SELECT_DESCRIPTIONS,
+    add_clothing_item,
+    add_clothing_items_bulk,
+    clear_description_cache,
+    get_all_clothing_descriptions
+)
+from utils.db_utils import get_db_connection, reset_pool, create_users_table, create_clothing_table
 
 def get_test_db_path():
-    return f"test_faishion_{uuid.uuid4()}.db"
+    # Named per pytest-xdist worker ("main" when not running in parallel)
+    worker_id = os.environ.get("PYTEST_XDIST_WORKER", "main")
+    return f"file:memdb_{worker_id}_{uuid.uuid4().hex}?mode=memory&cache=shared"
 
 def get_unique_username():
     return f"testuser_{uuid.uuid4().hex[:8]}"
 
-@pytest.fixture(scope="function")
-def test_db():
+@pytest.fixture(scope="session")
+def test_schema():
+    # One shared in-memory database with the tables, created once per session
     test_db_path = get_test_db_path()
+    keep_alive = sqlite3.connect(test_db_path, uri=True)
+    
+    old_db_path = os.environ.get("SQLITE_DB_PATH")
+    os.environ["SQLITE_DB_PATH"] = test_db_path
+    try:
+        create_users_table()
+        create_clothing_table()
+    finally:
+        restore_db_path(old_db_path)
+    
+    yield test_db_path
+    
+    reset_pool()
+    keep_alive.close()
+
+@pytest.fixture(scope="function")
+def test_db(test_schema):
+    test_db_path = test_schema
     test_username = get_unique_username()
     test_user_id = f"test-user-{uuid.uuid4().hex[:8]}"
     
@@ -26,9 +53,6 @@ def test_db():
     
     os.environ["SQLITE_DB_PATH"] = test_db_path
     
-    create_users_table()
-    create_clothing_table()
-    
     conn = None
     try:
         conn = get_db_connection()
@@ -50,18 +74,21 @@ def test_db():
     yield {"db_path": test_db_path, "user_id": test_user_id, "username": test_username}
     
     try:
-        time.sleep(0.1)
-        
-        if os.path.exists(test_db_path):
-            try:
-                os.remove(test_db_path)
-            except PermissionError:
-                print(f"Could not remove {test_db_path} - file may be locked")
+        # Remove this test's rows and cached results; the schema stays for the next test
+        clear_description_cache()
+        conn = get_db_connection()
+        conn.execute("DELETE FROM Clothing WHERE userId = ?", (test_user_id,))
+        conn.execute("DELETE FROM Users WHERE id = ?", (test_user_id,))
+        conn.commit()
+        conn.close()
     finally:
-        if old_db_path:
-            os.environ["SQLITE_DB_PATH"] = old_db_path
-        else:
-            os.environ.pop("SQLITE_DB_PATH", None)
+        restore_db_path(old_db_path)
+
+def restore_db_path(old_db_path):
+    if old_db_path:
+        os.environ["SQLITE_DB_PATH"] = old_db_path
+    else:
+        os.environ.pop("SQLITE_DB_PATH", None)
 
 
 def test_add_clothing_item_success(test_db):
@@ -99,53 +126,96 @@ def test_add_clothing_item_nonexistent_user(test_db):
     with pytest.raises(HTTPException) as excinfo:
         add_clothing_item(nonexistent_user_id, description)
     
+    assert excinfo.value.status_code == 404
+    assert excinfo.value.detail == "User not found"
+
+
+def test_add_clothing_item_nonexistent_user_leaves_no_image(test_db, tmp_path):
+    # Arrange
+    nonexistent_user_id = f"nonexistent-user-{uuid.uuid4().hex[:8]}"
+    
+    # Act
+    with patch('utils.clothing_utils.UPLOAD_DIR', str(tmp_path)):
+        with pytest.raises(HTTPException) as excinfo:
+            add_clothing_item(nonexistent_user_id, "Red shirt", io.BytesIO(b"fake image bytes"))
+    
+    # Assert
+    assert excinfo.value.status_code == 404
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_add_clothing_item_database_error(test_db, tmp_path):
+    # Arrange: the second row of the batch fails after the first was inserted
+    user_id = test_db["user_id"]
+    items = [("Blue jeans", io.BytesIO(b"jeans image")), ("Green sweater", io.BytesIO(b"sweater image"))]
+    schema = sqlite3.connect(test_db["db_path"], uri=True)
+    schema.execute("""
+    CREATE TRIGGER fail_green_sweater BEFORE INSERT ON Clothing WHEN NEW.description = 'Green sweater'
+    BEGIN SELECT RAISE(ABORT, 'Test database error'); END
+    """)
+    statements = []
+    conn = get_db_connection()
+    conn.set_trace_callback(statements.append)
+    conn.close()
+    
+    try:
+        # Act
+        with patch('utils.clothing_utils.UPLOAD_DIR', str(tmp_path)):
+            with pytest.raises(HTTPException) as excinfo:
+                add_clothing_items_bulk(user_id, items)
+    finally:
+        conn = get_db_connection()
+        conn.set_trace_callback(None)
+        conn.close()
+        schema.execute("DROP TRIGGER fail_green_sweater")
+        schema.close()
+    
+    # Assert: the partial batch was rolled back and its images removed
     assert excinfo.value.status_code == 500
-    assert "User not found" in excinfo.value.detail
+    assert "Database error" in excinfo.value.detail
+    assert statements.count("ROLLBACK") == 1
+    assert "COMMIT" not in statements
+    conn = get_db_connection()
+    rows = conn.execute("SELECT COUNT(*) FROM Clothing WHERE userId = ?", (user_id,)).fetchone()[0]
+    conn.close()
+    assert rows == 0
+    assert list(tmp_path.iterdir()) == []
 
 
-def test_add_clothing_item_database_error(test_db):
+def test_add_clothing_items_bulk_success(test_db):
     # Arrange
     user_id = test_db["user_id"]
-    description = "Green sweater"
+    descriptions = ["Blue jeans", "Red shirt", "Green sweater"]
     
-    with patch('utils.db_utils.get_db_connection') as mock_conn:
-        mock_cursor = MagicMock()
-        mock_cursor.fetchone.return_value = {"id": user_id}
-        mock_cursor.execute.side_effect = [None, Exception("Test database error")]
-        
-        mock_connection = MagicMock()
-        mock_connection.cursor.return_value = mock_cursor
-        mock_conn.return_value = mock_connection
-        
-        # Act & Assert
-        with pytest.raises(HTTPException) as excinfo:
-            add_clothing_item(user_id, description)
-        
-        assert excinfo.value.status_code == 500
-        assert "Database error" in excinfo.value.detail
-        
-        mock_connection.rollback.assert_called_once()
-        mock_connection.close.assert_called_once()
+    # Act
+    result = add_clothing_items_bulk(user_id, descriptions)
+    
+    # Assert
+    assert result["count"] == 3
+    assert len(result["ids"]) == 3
+    assert "Added items successfully" in result["message"]
+    stored = get_all_clothing_descriptions(user_id)
+    for desc in descriptions:
+        assert desc in stored
+
+
+def test_add_clothing_items_bulk_nonexistent_user(test_db):
+    # Arrange
+    nonexistent_user_id = f"nonexistent-user-{uuid.uuid4().hex[:8]}"
+    
+    # Act & Assert
+    with pytest.raises(HTTPException) as excinfo:
+        add_clothing_items_bulk(nonexistent_user_id, ["Red shirt", "Black boots"])
+    
+    assert excinfo.value.status_code == 404
+    assert excinfo.value.detail == "User not found"
 
 
 def test_get_all_clothing_descriptions_success(test_db):
     # Arrange
     user_id = test_db["user_id"]
     descriptions = ["Blue jeans", "Red shirt", "Green sweater"]
-    
-    conn = None
-    try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        for desc in descriptions:
-            cursor.execute(
-                "INSERT INTO Clothing (id, userId, description) VALUES (?, ?, ?)",
-                (str(uuid.uuid4()), user_id, desc)
-            )
-        conn.commit()
-    finally:
-        if conn:
-            conn.close()
+    add_clothing_items_bulk(user_id, descriptions)
     
     # Act
     result = get_all_clothing_descriptions(user_id)
@@ -156,6 +226,94 @@ def test_get_all_clothing_descriptions_success(test_db):
         assert desc in result
 
 
+def test_get_all_clothing_descriptions_cached_until_item_added(test_db):
+    # Arrange
+    user_id = test_db["user_id"]
+    add_clothing_items_bulk(user_id, ["Blue jeans"])
+    first = get_all_clothing_descriptions(user_id)
+    
+    # Act: a cached read does not touch the database
+    with patch('utils.db_utils.get_db_connection', side_effect=AssertionError("queried again")):
+        cached = get_all_clothing_descriptions(user_id)
+    add_clothing_item(user_id, "Red shirt")
+    refreshed = get_all_clothing_descriptions(user_id)
+    
+    # Assert
+    assert cached == first == ["Blue jeans"]
+    assert sorted(refreshed) == ["Blue jeans", "Red shirt"]
+
+
+def is_cached(user_id):
+    # True when get_all_clothing_descriptions answers without opening a connection
+    with patch('utils.db_utils.get_db_connection', side_effect=AssertionError("queried again")):
+        try:
+            get_all_clothing_descriptions(user_id)
+            return True
+        except AssertionError:
+            return False
+
+
+def read_with_write_in_flight(user_id, writer_id):
+    original_fetch = clothing_utils._fetch_descriptions
+    
+    def fetch(conn, userId, batch_size):
+        # A write for writer_id lands while the read is in flight
+        clothing_utils._invalidate_descriptions(writer_id)
+        yield from original_fetch(conn, userId, batch_size)
+    
+    with patch('utils.clothing_utils._fetch_descriptions', fetch):
+        return get_all_clothing_descriptions(user_id)
+
+
+def test_get_all_clothing_descriptions_cache_expires_and_is_bounded(test_db):
+    # Arrange
+    user_id = test_db["user_id"]
+    other_user_id = f"uncached-user-{uuid.uuid4().hex[:8]}"
+    add_clothing_items_bulk(user_id, ["Blue jeans"])
+    
+    # Act & Assert: with a zero TTL the entry is already expired
+    with patch('utils.clothing_utils.DESC_CACHE_TTL_SECONDS', 0):
+        get_all_clothing_descriptions(user_id)
+        assert not is_cached(user_id)
+    
+    # Act & Assert: with room for one entry, caching another user evicts the first
+    with patch('utils.clothing_utils.DESC_CACHE_MAXSIZE', 1):
+        get_all_clothing_descriptions(user_id)
+        assert is_cached(user_id)
+        get_all_clothing_descriptions(other_user_id)
+        assert not is_cached(user_id)
+
+
+def test_get_all_clothing_descriptions_write_only_invalidates_that_user(test_db):
+    # Arrange
+    user_id = test_db["user_id"]
+    other_user_id = f"other-user-{uuid.uuid4().hex[:8]}"
+    add_clothing_items_bulk(user_id, ["Blue jeans"])
+    
+    # Act & Assert: another user's write doesn't stop this read from being cached
+    assert read_with_write_in_flight(user_id, other_user_id) == ["Blue jeans"]
+    assert is_cached(user_id)
+    
+    # Act & Assert: a write for the same user does
+    clear_description_cache()
+    assert read_with_write_in_flight(user_id, user_id) == ["Blue jeans"]
+    assert not is_cached(user_id)
+
+
+def test_get_all_clothing_descriptions_reads_in_batches(test_db, monkeypatch):
+    # Arrange: more rows than one batch
+    monkeypatch.setattr(clothing_utils, "DESCRIPTION_BATCH_SIZE", 2)
+    user_id = test_db["user_id"]
+    descriptions = ["Blue jeans", "Red shirt", "Green sweater"]
+    add_clothing_items_bulk(user_id, descriptions)
+    
+    # Act
+    result = get_all_clothing_descriptions(user_id)
+    
+    # Assert
+    assert sorted(result) == sorted(descriptions)
+
+
 def test_get_all_clothing_descriptions_no_items(test_db):
     # Arrange
     user_id = test_db["user_id"]
@@ -173,7 +331,7 @@ def test_get_all_clothing_descriptions_database_error(test_db):
     
     with patch('utils.db_utils.get_db_connection') as mock_conn:
         mock_cursor = MagicMock()
-        mock_cursor.execute.side_effect = Exception("Test database error")
+        mock_cursor.execute.side_effect = sqlite3.OperationalError("Test database error")
         
         mock_connection = MagicMock()
         mock_connection.cursor.return_value = mock_cursor
@@ -184,4 +342,19 @@ def test_get_all_clothing_descriptions_database_error(test_db):
         
         # Assert
         assert result == []
-        mock_connection.close.assert_called_once()
\ No newline at end of file
+        mock_connection.close.assert_called_once()
+
+
+def test_select_descriptions_uses_covering_index(test_db):
+    # Arrange
+    user_id = test_db["user_id"]
+    
+    # Act
+    conn = get_db_connection()
+    plan = conn.execute("EXPLAIN QUERY PLAN " + SQL_SELECT_DESCRIPTIONS, (user_id,)).fetchall()
+    conn.close()
+    
+    # Assert: a userId lookup on the index, not a scan of Clothing
+    details = " ".join(row[3] for row in plan)
+    assert "COVERING INDEX idx_clothing_user_desc" in details
+    assert "SCAN" not in details
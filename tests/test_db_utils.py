@@ -1,41 +1,90 @@
 import os
+import gc
+import time
+import uuid
+import threading
 import sqlite3
 import pytest
 from unittest.mock import patch, MagicMock
 from fastapi import HTTPException
 
-import sys
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils import db_utils
 from utils.db_utils import (
+    USERS_TABLE_DDL,
+    db_cursor,
     get_db_connection,
     create_users_table,
     create_clothing_table,
     init_db,
+    pooled_connection,
+    reset_pool,
+    transaction,
     get_tables,
+    clear_tables_cache,
     check_db_connection
 )
 
-TEST_DB_PATH = "test_faishion.db"
+def get_test_db_path():
+    # Named per pytest-xdist worker ("main" when not running in parallel)
+    worker_id = os.environ.get("PYTEST_XDIST_WORKER", "main")
+    return f"file:memdb_{worker_id}_{uuid.uuid4().hex}?mode=memory&cache=shared"
+
+
+@pytest.fixture(scope="session")
+def test_database():
+    # Arrange: one shared in-memory database with the schema, created once per session
+    test_db_path = get_test_db_path()
+    keep_alive = sqlite3.connect(test_db_path, uri=True)
+    
+    old_db_path = os.environ.get("SQLITE_DB_PATH")
+    os.environ["SQLITE_DB_PATH"] = test_db_path
+    init_db()
+    restore_db_path(old_db_path)
+    
+    yield test_db_path
+    
+    reset_pool()
+    keep_alive.close()
 
 
 @pytest.fixture(autouse=True)
-def setup_and_teardown():
+def setup_and_teardown(test_database):
     # Arrange
     old_db_path = os.environ.get("SQLITE_DB_PATH")
-    os.environ["SQLITE_DB_PATH"] = TEST_DB_PATH
+    os.environ["SQLITE_DB_PATH"] = test_database
     
     yield
     
-    # Cleanup
-    if os.path.exists(TEST_DB_PATH):
-        os.remove(TEST_DB_PATH)
+    # Cleanup: only rows are removed between tests, the schema is kept
+    conn = sqlite3.connect(test_database, uri=True)
+    conn.execute("DELETE FROM Clothing")
+    conn.execute("DELETE FROM Users")
+    conn.commit()
+    conn.close()
     
+    restore_db_path(old_db_path)
+
+
+def restore_db_path(old_db_path):
     if old_db_path:
         os.environ["SQLITE_DB_PATH"] = old_db_path
     else:
         os.environ.pop("SQLITE_DB_PATH", None)
 
 
+def remove_db_file(path):
+    # Drop lingering connection objects, then retry briefly only while the file is locked (Windows)
+    gc.collect()
+    for _ in range(10):
+        try:
+            os.remove(path)
+            break
+        except FileNotFoundError:
+            break
+        except PermissionError:
+            time.sleep(0.01)
+
+
 def test_get_db_connection():
     # Act
     conn = get_db_connection()
@@ -43,18 +92,47 @@ def test_get_db_connection():
     cursor.execute("PRAGMA foreign_keys")
     foreign_keys_status = cursor.fetchone()[0]
     
+    cursor.execute("PRAGMA journal_mode")
+    journal_mode = cursor.fetchone()[0]
+    
     # Assert
     assert conn is not None
     assert foreign_keys_status == 1
-    assert conn.row_factory == sqlite3.Row
+    assert conn.row_factory is None  # plain tuple rows
+    assert journal_mode == "memory"  # WAL is skipped for in-memory databases
     
     conn.close()
 
 
-def test_get_db_connection_error():
+def test_get_db_connection_on_disk_uses_wal():
     # Arrange
+    test_db_file = f"test_faishion_{uuid.uuid4().hex}.db"
+    os.environ["SQLITE_DB_PATH"] = test_db_file
+    
+    try:
+        # Act
+        conn = get_db_connection()
+        journal_mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+        synchronous = conn.execute("PRAGMA synchronous").fetchone()[0]
+        cache_size = conn.execute("PRAGMA cache_size").fetchone()[0]
+        conn.close()
+        
+        # Assert
+        assert journal_mode == "wal"
+        assert synchronous == 1  # NORMAL
+        assert cache_size == -64000
+    finally:
+        # close() only returned the connection to the pool
+        reset_pool()
+        for suffix in ("", "-wal", "-shm"):
+            remove_db_file(test_db_file + suffix)
+
+
+def test_get_db_connection_error():
+    # Arrange: no idle pooled connection, so a new one has to be opened
+    reset_pool()
     with patch('sqlite3.connect') as mock_connect:
-        mock_connect.side_effect = Exception("Test connection error")
+        mock_connect.side_effect = sqlite3.OperationalError("Test connection error")
         
         # Act & Assert
         with pytest.raises(HTTPException) as excinfo:
@@ -63,6 +141,191 @@ def test_get_db_connection_error():
         assert "Database connection error" in excinfo.value.detail
 
 
+def test_get_db_connection_caps_borrowed_connections(monkeypatch):
+    # Arrange: a fresh pool of two connections that gives up waiting quickly
+    monkeypatch.setattr(db_utils, "POOL_SIZE", 2)
+    monkeypatch.setattr(db_utils, "POOL_TIMEOUT_SECONDS", 0.05)
+    reset_pool()
+    first = get_db_connection()
+    second = get_db_connection()
+    
+    try:
+        # Act & Assert: a third borrower has to wait, then gets a 503
+        with pytest.raises(HTTPException) as excinfo:
+            get_db_connection()
+        assert excinfo.value.status_code == 503
+        
+        # Returning one frees its slot, and closing it twice doesn't free two
+        first.close()
+        first.close()
+        third = get_db_connection()
+        assert third is first
+        with pytest.raises(HTTPException):
+            get_db_connection()
+        third.close()
+    finally:
+        second.close()
+        reset_pool()
+
+
+def test_get_db_connection_waits_for_a_returned_connection(monkeypatch):
+    # Arrange
+    monkeypatch.setattr(db_utils, "POOL_SIZE", 1)
+    reset_pool()
+    held = get_db_connection()
+    borrowed = []
+    
+    # Act
+    waiter = threading.Thread(target=lambda: borrowed.append(get_db_connection()))
+    waiter.start()
+    time.sleep(0.05)
+    waiting = not borrowed
+    held.close()
+    waiter.join(timeout=5)
+    
+    # Assert
+    assert waiting
+    assert borrowed == [held]
+    borrowed[0].close()
+    reset_pool()
+
+
+def test_db_cursor_reuses_connection():
+    # Act
+    with db_cursor() as cursor:
+        first_conn = cursor.connection
+    with db_cursor() as cursor:
+        second_conn = cursor.connection
+    
+    # Assert
+    assert first_conn is second_conn
+
+
+def test_db_cursor_returns_connection_to_pool():
+    # Arrange
+    used = []
+    
+    def worker():
+        with db_cursor() as cursor:
+            used.append(cursor.connection)
+    
+    # Act: a connection used by another thread is back in the pool once its block exits
+    thread = threading.Thread(target=worker)
+    thread.start()
+    thread.join()
+    with pooled_connection() as conn:
+        reused = conn
+    
+    # Assert
+    assert used[0] is reused
+
+
+def test_pooled_connection_is_reused():
+    # Act
+    with pooled_connection() as conn:
+        first_conn = conn
+    with pooled_connection() as conn:
+        second_conn = conn
+
+    # Assert
+    assert first_conn is second_conn
+
+
+def test_get_db_connection_with_block_keeps_connection():
+    # Arrange
+    create_users_table()
+    conn = get_db_connection()
+    
+    # Act: a with block commits but does not hand the connection back
+    with conn:
+        conn.execute("BEGIN")
+        conn.execute(
+            "INSERT INTO Users (id, username, password) VALUES (?, ?, ?)",
+            ("pooled-id", "pooled_user", "pw")
+        )
+    other = get_db_connection()
+    row = other.execute("SELECT id FROM Users WHERE id = ?", ("pooled-id",)).fetchone()
+    
+    # Assert
+    assert not conn.in_pool
+    assert other is not conn
+    assert row is not None
+    assert conn.execute("SELECT 1").fetchone() == (1,)
+    other.close()
+    conn.close()
+
+
+def test_db_cursor_rolls_back_on_error():
+    # Arrange
+    create_users_table()
+    
+    # Act
+    with pytest.raises(sqlite3.IntegrityError):
+        with db_cursor() as cursor:
+            cursor.execute(
+                "INSERT INTO Users (id, username, password) VALUES (?, ?, ?)",
+                ("rollback-id", "rollback_user", "pw")
+            )
+            cursor.execute(
+                "INSERT INTO Users (id, username, password) VALUES (?, ?, ?)",
+                ("rollback-id", "rollback_user_2", "pw")
+            )
+    
+    with db_cursor() as cursor:
+        cursor.execute("SELECT id FROM Users WHERE id = ?", ("rollback-id",))
+        row = cursor.fetchone()
+    
+    # Assert
+    assert row is None
+
+
+def test_transaction_commits_block_once():
+    # Arrange
+    create_users_table()
+    statements = []
+    
+    # Act
+    with pooled_connection() as conn:
+        conn.set_trace_callback(statements.append)
+        with transaction(conn):
+            for i in range(3):
+                conn.execute(
+                    "INSERT INTO Users (id, username, password) VALUES (?, ?, ?)",
+                    (f"tx-id-{i}", f"tx_user_{i}", "pw")
+                )
+        conn.set_trace_callback(None)
+        count = conn.execute("SELECT COUNT(*) FROM Users WHERE id LIKE 'tx-id-%'").fetchone()[0]
+    
+    # Assert
+    assert count == 3
+    assert statements[0] == "BEGIN IMMEDIATE"
+    assert statements.count("COMMIT") == 1
+
+
+def test_transaction_rolls_back_on_error():
+    # Arrange
+    create_users_table()
+    
+    # Act
+    with pooled_connection() as conn:
+        with pytest.raises(sqlite3.IntegrityError):
+            with transaction(conn):
+                conn.execute(
+                    "INSERT INTO Users (id, username, password) VALUES (?, ?, ?)",
+                    ("tx-rollback-id", "tx_rollback_user", "pw")
+                )
+                conn.execute(
+                    "INSERT INTO Users (id, username, password) VALUES (?, ?, ?)",
+                    ("tx-rollback-id", "tx_rollback_user_2", "pw")
+                )
+        row = conn.execute("SELECT id FROM Users WHERE id = ?", ("tx-rollback-id",)).fetchone()
+        in_transaction = conn.in_transaction
+    
+    # Assert
+    assert row is None
+    assert not in_transaction
+
+
 def test_create_users_table():
     # Act
     create_users_table()
@@ -73,7 +336,7 @@ def test_create_users_table():
     table_exists = cursor.fetchone()
     
     cursor.execute("PRAGMA table_info(Users)")
-    columns = {row['name']: row['type'] for row in cursor.fetchall()}
+    columns = {row[1]: row[2] for row in cursor.fetchall()}  # (cid, name, type, ...)
     
     # Assert
     assert table_exists is not None
@@ -84,6 +347,17 @@ def test_create_users_table():
     conn.close()
 
 
+def test_create_users_table_with_cursor():
+    # Arrange
+    mock_cursor = MagicMock()
+    
+    # Act
+    create_users_table(mock_cursor)
+    
+    # Assert
+    mock_cursor.execute.assert_called_once_with(USERS_TABLE_DDL)
+
+
 def test_create_clothing_table():
     # Arrange
     create_users_table()
@@ -97,21 +371,23 @@ def test_create_clothing_table():
     table_exists = cursor.fetchone()
     
     cursor.execute("PRAGMA table_info(Clothing)")
-    columns = {row['name']: row['type'] for row in cursor.fetchall()}
+    columns = {row[1]: row[2] for row in cursor.fetchall()}  # (cid, name, type, ...)
     
     cursor.execute("PRAGMA foreign_key_list(Clothing)")
     fk_info = cursor.fetchone()
     
+    cursor.execute("SELECT name FROM sqlite_master WHERE type='index' AND name='idx_clothing_user_desc'")
+    index_exists = cursor.fetchone()
+    
     # Assert
     assert table_exists is not None
+    assert index_exists is not None
     assert 'id' in columns
     assert 'userId' in columns
     assert 'description' in columns
     assert 'image' in columns
     assert fk_info is not None
-    assert fk_info['table'] == 'Users'
-    assert fk_info['from'] == 'userId'
-    assert fk_info['to'] == 'id'
+    assert fk_info[2:5] == ('Users', 'userId', 'id')  # (id, seq, table, from, to, ...)
     
     conn.close()
 
@@ -131,6 +407,24 @@ def test_init_db():
     conn.close()
 
 
+def test_init_db_uses_one_transaction():
+    # Arrange
+    statements = []
+    with db_cursor() as cursor:
+        conn = cursor.connection
+    conn.set_trace_callback(statements.append)
+    
+    # Act
+    init_db()
+    
+    conn.set_trace_callback(None)
+    
+    # Assert
+    keywords = [s.strip().rstrip(";").upper() for s in statements]
+    assert keywords.count("BEGIN") == 1
+    assert keywords.count("COMMIT") == 1
+
+
 def test_get_tables():
     # Arrange
     init_db()
@@ -146,10 +440,11 @@ def test_get_tables():
 
 def test_get_tables_error():
     # Arrange
+    clear_tables_cache()
     with patch('utils.db_utils.get_db_connection') as mock_conn:
         mock_connection = MagicMock()
         mock_cursor = MagicMock()
-        mock_cursor.execute.side_effect = Exception("Test error")
+        mock_cursor.execute.side_effect = sqlite3.OperationalError("Test error")
         mock_connection.cursor.return_value = mock_cursor
         mock_conn.return_value = mock_connection
         
@@ -169,4 +464,25 @@ def test_check_db_connection_success():
     result = check_db_connection()
     
     # Assert
-    assert result['status'] == 'connected'
\ No newline at end of file
+    assert result['status'] == 'connected'
+
+
+def test_check_db_connection_error():
+    # Arrange
+    error = HTTPException(status_code=500, detail="Database connection error: unavailable")
+    
+    # Act
+    with patch('utils.db_utils.get_db_connection', side_effect=error):
+        result = check_db_connection()
+    
+    # Assert
+    assert result['status'] == 'error'
+    assert "Database connection error" in result['error_message']
+
+
+def test_check_db_connection_does_not_hide_bugs():
+    # Arrange: only database errors count as an unhealthy database
+    with patch('utils.db_utils.get_db_connection', side_effect=TypeError("bug")):
+        # Act & Assert
+        with pytest.raises(TypeError):
+            check_db_connection()
@@ -0,0 +1,230 @@
+# tests/test_main.py
+import sys
+import gzip
+import json
+import time
+import uuid
+import logging
+import importlib
+import pytest
+from unittest.mock import patch, MagicMock
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+
+from utils.db_utils import reset_pool
+
+
+@pytest.fixture(scope="module")
+def main_module():
+    # app.services loads the captioning model and API clients at import; the routes tested here don't use it
+    with patch.dict(sys.modules, {"app.services": MagicMock()}):
+        module = importlib.import_module("app.main")
+    yield module
+    reset_pool()
+
+
+@pytest.fixture
+def client(main_module, tmp_path, monkeypatch):
+    # Arrange: a fresh on-disk database per test, and no background health refresh
+    monkeypatch.setenv("SQLITE_DB_PATH", str(tmp_path / "test_main.db"))
+
+    async def idle_refresher():
+        pass
+
+    monkeypatch.setattr(main_module, "_health_refresher", idle_refresher)
+    with TestClient(main_module.app) as test_client:
+        yield test_client
+
+
+def user_payload():
+    return {"username": f"user_{uuid.uuid4().hex[:8]}", "password": "secure_password"}
+
+
+def gzip_headers():
+    return {"Content-Encoding": "gzip", "Content-Type": "application/json"}
+
+
+def test_plain_json_body_passes_through(client):
+    # Act
+    response = client.post("/register", json=user_payload())
+
+    # Assert
+    assert response.status_code == 201
+
+
+def test_gzip_body_is_decompressed(client):
+    # Arrange
+    payload = user_payload()
+    body = gzip.compress(json.dumps(payload).encode())
+
+    # Act
+    response = client.post("/register", content=body, headers=gzip_headers())
+
+    # Assert
+    assert response.status_code == 201
+    assert response.json()["username"] == payload["username"]
+
+
+def test_corrupt_gzip_body_is_rejected(client):
+    # Act
+    response = client.post("/register", content=b"not gzip data", headers=gzip_headers())
+
+    # Assert
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid gzip request body"
+
+
+def test_gzip_body_over_limit_is_rejected(client, main_module, monkeypatch):
+    # Arrange: a few kilobytes that expand well past the limit
+    monkeypatch.setattr(main_module, "MAX_DECOMPRESSED_BODY_BYTES", 64 * 1024)
+    body = gzip.compress(json.dumps({"username": "a" * 1_000_000, "password": "pw"}).encode())
+
+    # Act
+    response = client.post("/register", content=body, headers=gzip_headers())
+
+    # Assert
+    assert len(body) < 64 * 1024
+    assert response.status_code == 413
+    assert response.json()["detail"] == "Decompressed request body too large"
+
+
+def register_user(client):
+    payload = user_payload()
+    client.post("/register", json=payload)
+    return client.post("/login", json=payload).json()["userId"]
+
+
+def test_upload_clothing_bulk_success(client):
+    # Arrange
+    user_id = register_user(client)
+    descriptions = ["Blue jeans", "Red shirt"]
+
+    # Act
+    response = client.post("/upload-clothing/bulk", json={"userId": user_id, "descriptions": descriptions})
+
+    # Assert
+    assert response.status_code == 200
+    assert response.json()["result"]["count"] == 2
+    assert sorted(client.get("/clothing/descriptions", params={"userId": user_id}).json()) == sorted(descriptions)
+
+
+def test_upload_clothing_bulk_empty_list(client):
+    # Arrange
+    user_id = register_user(client)
+
+    # Act
+    response = client.post("/upload-clothing/bulk", json={"userId": user_id, "descriptions": []})
+
+    # Assert
+    assert response.status_code == 200
+    assert response.json()["result"]["count"] == 0
+    assert response.json()["result"]["ids"] == []
+
+
+def test_upload_clothing_bulk_unknown_user(client):
+    # Act
+    response = client.post(
+        "/upload-clothing/bulk",
+        json={"userId": f"nonexistent-user-{uuid.uuid4().hex[:8]}", "descriptions": ["Red shirt"]}
+    )
+
+    # Assert
+    assert response.status_code == 404
+    assert response.json()["detail"] == "User not found"
+
+
+def test_health_serves_cached_status(client, main_module, monkeypatch):
+    # Arrange: a fresh cached probe
+    check = MagicMock(return_value={"status": "error", "error_message": "should not be called"})
+    monkeypatch.setattr(main_module.db_utils, "check_db_connection", check)
+    monkeypatch.setitem(main_module._HEALTH, "ts", time.monotonic())
+    monkeypatch.setitem(main_module._HEALTH, "status", "connected")
+    monkeypatch.setitem(main_module._HEALTH, "error", None)
+
+    # Act
+    response = client.get("/health")
+
+    # Assert
+    assert response.json() == {"status": "healthy", "database_status": "connected", "error": None}
+    check.assert_not_called()
+
+
+def test_health_refreshes_expired_status(client, main_module, monkeypatch):
+    # Arrange: a probe older than the TTL
+    check = MagicMock(return_value={"status": "error", "error_message": "database is locked"})
+    monkeypatch.setattr(main_module.db_utils, "check_db_connection", check)
+    monkeypatch.setitem(main_module._HEALTH, "ts", time.monotonic() - main_module.HEALTH_TTL_SECONDS - 1)
+    monkeypatch.setitem(main_module._HEALTH, "status", "connected")
+
+    # Act
+    response = client.get("/health")
+
+    # Assert
+    assert response.json() == {"status": "healthy", "database_status": "error", "error": "database is locked"}
+    check.assert_called_once()
+
+
+def test_health_reports_failed_refresh(client, main_module, monkeypatch, caplog):
+    # Arrange
+    check = MagicMock(side_effect=RuntimeError("probe crashed"))
+    monkeypatch.setattr(main_module.db_utils, "check_db_connection", check)
+    monkeypatch.setitem(main_module._HEALTH, "ts", 0.0)
+
+    # Act
+    with caplog.at_level(logging.ERROR, logger="app.main"):
+        response = client.get("/health")
+
+    # Assert
+    assert response.json() == {"status": "error", "message": "Health check failed: probe crashed"}
+    assert "Health check error: probe crashed" in caplog.text
+
+
+def test_shutdown_cancels_health_refresher(main_module, tmp_path, monkeypatch):
+    # Arrange
+    monkeypatch.setenv("SQLITE_DB_PATH", str(tmp_path / "test_main.db"))
+    monkeypatch.setattr(main_module.db_utils, "check_db_connection", MagicMock(return_value={"status": "connected"}))
+
+    # Act
+    with TestClient(main_module.app):
+        task = main_module._health_task
+        running = not task.done()
+
+    # Assert
+    assert running
+    assert task.cancelled()
+
+
+def test_list_clothing_descriptions(client):
+    # Arrange
+    user_id = register_user(client)
+    client.post("/upload-clothing/bulk", json={"userId": user_id, "descriptions": ["Blue jeans", "Red shirt"]})
+
+    # Act
+    response = client.get("/clothing/descriptions", params={"userId": user_id})
+
+    # Assert
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    assert sorted(response.json()) == ["Blue jeans", "Red shirt"]
+
+
+def test_list_clothing_descriptions_unknown_user_is_empty(client):
+    # Act
+    response = client.get("/clothing/descriptions", params={"userId": f"nonexistent-user-{uuid.uuid4().hex[:8]}"})
+
+    # Assert
+    assert response.status_code == 200
+    assert response.json() == []
+
+
+def test_list_clothing_descriptions_connection_error(client):
+    # Arrange
+    error = HTTPException(status_code=500, detail="Database connection error: unavailable")
+
+    # Act
+    with patch("utils.db_utils.get_db_connection", side_effect=error):
+        response = client.get("/clothing/descriptions", params={"userId": f"uncached-user-{uuid.uuid4().hex[:8]}"})
+
+    # Assert
+    assert response.status_code == 500
+    assert response.json()["detail"] == "Database connection error: unavailable"
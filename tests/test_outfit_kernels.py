@@ -0,0 +1,91 @@
+# tests/test_outfit_kernels.py
+import numpy as np
+import pytest
+
+try:
+    from ml import outfit_suggester
+except (ImportError, OSError):
+    # OSError: spaCy is installed but the en_core_web_sm model is not
+    pytest.skip("ml.outfit_suggester needs spaCy and en_core_web_sm", allow_module_level=True)
+
+N_ITEMS = 257
+N_WEATHER = 7
+
+
+@pytest.fixture(scope="module")
+def kernel_inputs():
+    # Fixed pseudo-random item arrays shaped like OutfitSuggester._load_items output
+    rng = np.random.default_rng(42)
+    seasonality = rng.random((N_ITEMS, 4), dtype=np.float32)
+    season_weights = rng.random(4, dtype=np.float32)
+    material_mask = rng.integers(0, 2**20, N_ITEMS, dtype=np.uint64)
+    good_masks = rng.integers(0, 2**20, N_WEATHER, dtype=np.uint64)
+    bad_masks = rng.integers(0, 2**20, N_WEATHER, dtype=np.uint64)
+    material_weights = (rng.random(N_WEATHER, dtype=np.float32) * np.float32(0.3))
+    wet_bonus = rng.choice(np.array([0.0, 0.1, 0.2, 0.3], dtype=np.float32), N_ITEMS)
+    # Whole and half steps so the diff < 0.5, < 2 and > 5 branches are all hit
+    formality = (rng.integers(0, 21, N_ITEMS) / 2).astype(np.float32)
+    return {
+        "seasonality": seasonality,
+        "season_weights": season_weights,
+        "material_mask": material_mask,
+        "good_masks": good_masks,
+        "bad_masks": bad_masks,
+        "material_weights": material_weights,
+        "wet_bonus": wet_bonus,
+        "formality": formality,
+    }
+
+
+def weather_args(inputs, is_wet):
+    return (
+        inputs["seasonality"], inputs["season_weights"], inputs["material_mask"],
+        inputs["good_masks"], inputs["bad_masks"], inputs["material_weights"],
+        inputs["wet_bonus"], is_wet
+    )
+
+
+@pytest.mark.parametrize("is_wet", [False, True])
+def test_cython_weather_scores_match_numpy(kernel_inputs, is_wet):
+    # Arrange
+    kernels = pytest.importorskip("ml._kernels")
+    args = weather_args(kernel_inputs, is_wet)
+
+    # Act
+    expected = outfit_suggester._py_weather_scores(*args)
+    result = kernels.weather_scores(*args)
+
+    # Assert
+    np.testing.assert_allclose(result, expected, rtol=1e-5, atol=1e-6)
+
+
+@pytest.mark.parametrize("occasion_formality", [0.0, 3.5, 6.0, 10.0])
+def test_cython_formality_scores_match_numpy(kernel_inputs, occasion_formality):
+    # Arrange
+    kernels = pytest.importorskip("ml._kernels")
+    formality = kernel_inputs["formality"]
+
+    # Act
+    expected = outfit_suggester._py_formality_scores(formality, occasion_formality)
+    result = kernels.formality_scores(formality, occasion_formality)
+
+    # Assert
+    np.testing.assert_allclose(result, expected, rtol=1e-5, atol=1e-6)
+
+
+@pytest.mark.parametrize("is_wet,occasion_formality", [(False, 2.5), (True, 7.0)])
+def test_numba_overall_scores_match_numpy(kernel_inputs, is_wet, occasion_formality):
+    # Arrange
+    pytest.importorskip("numba")
+    args = weather_args(kernel_inputs, is_wet)
+    formality = kernel_inputs["formality"]
+
+    # Act
+    expected = (
+        outfit_suggester._py_weather_scores(*args) * 0.4 +
+        outfit_suggester._py_formality_scores(formality, occasion_formality) * 0.6
+    )
+    result = outfit_suggester._score_all_parallel(*args, formality, occasion_formality)
+
+    # Assert
+    np.testing.assert_allclose(result, expected, rtol=1e-5, atol=1e-6)
@@ -0,0 +1,131 @@
+# tests/test_outfit_suggester.py
+import threading
+import pandas as pd
+import pytest
+from unittest.mock import patch, MagicMock
+
+try:
+    from ml import outfit_suggester
+    from ml.outfit_suggester import OutfitSuggester
+except (ImportError, OSError):
+    # OSError: spaCy is installed but the en_core_web_sm model is not
+    pytest.skip("ml.outfit_suggester needs spaCy and en_core_web_sm", allow_module_level=True)
+
+COLORS = ["red", "blue", "black", "white", "green", "beige", "navy", "grey"]
+MATERIALS = ["cotton", "denim", "leather", "wool", "silk", "linen"]
+TYPES = ["t-shirt", "jeans", "boots", "jacket", "dress", "sneakers", "scarf", "blouse", "skirt", "coat"]
+
+
+def make_wardrobe(size, offset):
+    # Deterministic descriptions; each wardrobe has its own size and mix of items
+    return [
+        f"{COLORS[(i + offset) % len(COLORS)]} {MATERIALS[(i * 3 + offset) % len(MATERIALS)]} "
+        f"{TYPES[(i * 7 + offset) % len(TYPES)]}"
+        for i in range(size)
+    ]
+
+
+def test_suggest_outfit_is_reentrant():
+    # Arrange: one shared suggester, as in app.services, and a different wardrobe per thread
+    suggester = OutfitSuggester()
+    wardrobes = [make_wardrobe(size, offset) for offset, size in enumerate([3, 12, 40, 7, 90, 25, 150, 60])]
+    args = ("casual", "light rain", 12)
+    expected = [suggester.suggest_outfit(wardrobe, *args) for wardrobe in wardrobes]
+    results = [[] for _ in wardrobes]
+    errors = []
+
+    def worker(k):
+        for _ in range(10):
+            try:
+                results[k].append(suggester.suggest_outfit(wardrobes[k], *args))
+            except Exception as e:
+                errors.append(e)
+
+    # Act
+    threads = [threading.Thread(target=worker, args=(k,)) for k in range(len(wardrobes))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # Assert: no call saw another call's items
+    assert errors == []
+    for k, outfits in enumerate(results):
+        assert outfits == [expected[k]] * 10
+
+
+def test_process_clothing_items_returns_structured_array():
+    # Arrange
+    suggester = OutfitSuggester()
+    wardrobe = make_wardrobe(12, 0) + ["striped cotton t-shirt", "plaid wool skirt"]
+    expected = [suggester._extract_features_from_description(description) for description in wardrobe]
+
+    # Act
+    items = suggester.process_clothing_items(wardrobe)
+
+    # Assert
+    assert items.dtype == OutfitSuggester.ITEM_DTYPE
+    assert len(items) == len(wardrobe)
+    for item, features in zip(items, expected):
+        assert item['description'] == features['description']
+        assert item['category'] == features['category']
+        assert item['formality'] == pytest.approx(features['formality'])
+        assert item['versatility'] == pytest.approx(features['versatility'])
+        assert list(item['seasonality']) == pytest.approx(
+            [features['seasonality'][season] for season in OutfitSuggester.SEASONS]
+        )
+        assert list(suggester.pattern_keywords)[item['pattern']] == features['pattern']
+
+
+def test_process_clothing_items_returns_dataframe_when_asked():
+    # Arrange
+    suggester = OutfitSuggester(return_dataframe=True)
+    wardrobe = make_wardrobe(12, 0)
+    expected = [suggester._extract_features_from_description(description) for description in wardrobe]
+
+    # Act
+    items = suggester.process_clothing_items(wardrobe)
+
+    # Assert
+    assert isinstance(items, pd.DataFrame)
+    assert items['description'].tolist() == wardrobe
+    assert items['category'].tolist() == [features['category'] for features in expected]
+    assert items['formality'].tolist() == pytest.approx([features['formality'] for features in expected])
+
+
+def test_feature_cache_hit_skips_spacy():
+    # Arrange
+    suggester = OutfitSuggester()
+    nlp = MagicMock(wraps=outfit_suggester.nlp)
+
+    # Act
+    with patch.object(outfit_suggester, "nlp", nlp):
+        first = suggester._get_item_features("blue denim jeans")
+        second = suggester._get_item_features("blue denim jeans")
+
+    # Assert
+    assert nlp.call_count == 1
+    assert second is first
+
+
+def test_feature_cache_evicts_least_recently_used():
+    # Arrange: room for two descriptions
+    suggester = OutfitSuggester()
+    suggester.FEATURE_CACHE_SIZE = 2
+    nlp = MagicMock(wraps=outfit_suggester.nlp)
+
+    # Act
+    with patch.object(outfit_suggester, "nlp", nlp):
+        suggester._get_item_features("red cotton t-shirt")
+        suggester._get_item_features("blue denim jeans")
+        # A hit makes the t-shirt the most recently used, so the jeans go first
+        suggester._get_item_features("red cotton t-shirt")
+        suggester._get_item_features("black leather boots")
+        calls_before_reload = nlp.call_count
+        suggester._get_item_features("red cotton t-shirt")
+        suggester._get_item_features("blue denim jeans")
+
+    # Assert
+    assert calls_before_reload == 3
+    assert nlp.call_count == 4
+    assert list(suggester._feat_cache) == ["red cotton t-shirt", "blue denim jeans"]
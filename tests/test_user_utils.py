@@ -1,17 +1,30 @@
 # tests/test_user_utils.py
+import sqlite3
 import pytest
 import hashlib
 from unittest.mock import patch, MagicMock
 from fastapi import HTTPException
-import sys
-import os
-
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from utils import user_utils
 
 
 def test_hash_password():
+    # Arrange
+    password = "test_password"
+    salt = "00112233445566778899aabbccddeeff"
+    expected_hash = hashlib.scrypt(
+        password.encode(), salt=bytes.fromhex(salt), n=2**14, r=8, p=1, dklen=32
+    ).hex()
+    
+    # Act
+    result = user_utils.hash_password(password, salt)
+    
+    # Assert
+    assert result == expected_hash
+    assert result != user_utils.hash_password(password, "ff" * 16)
+
+
+def test_hash_password_without_salt_is_legacy_sha256():
     # Arrange
     password = "test_password"
     expected_hash = hashlib.sha256(password.encode()).hexdigest()
@@ -30,21 +43,24 @@ def test_register_user_success(mock_get_connection):
     mock_cursor = MagicMock()
     mock_conn.cursor.return_value = mock_cursor
     mock_get_connection.return_value = mock_conn
-    mock_cursor.fetchone.return_value = None
+    mock_cursor.rowcount = 1
     username = "new_user"
     password = "secure_password"
     
+    salt_bytes = bytes(range(16))
+    
     # Act
-    with patch('uuid.uuid4', return_value='test-uuid'):
+    with patch('secrets.token_hex', return_value='test-uuid'), patch('os.urandom', return_value=salt_bytes):
         result = user_utils.register_user(username, password)
     
     # Assert
-    mock_cursor.execute.assert_any_call("SELECT * FROM Users WHERE username = ?", (username,))
-    mock_cursor.execute.assert_any_call(
-        "INSERT INTO Users (id, username, password) VALUES (?, ?, ?)",
-        ('test-uuid', username, user_utils.hash_password(password))
+    salt = salt_bytes.hex()
+    mock_cursor.execute.assert_called_once_with(
+        "INSERT INTO Users (id, username, password, salt) VALUES (?, ?, ?, ?) "
+        "ON CONFLICT(username) DO NOTHING",
+        ('test-uuid', username, user_utils.hash_password(password, salt), salt)
     )
-    mock_conn.commit.assert_called_once()
+    mock_conn.commit.assert_not_called()  # autocommit: the INSERT commits itself
     mock_conn.close.assert_called_once()
     assert result["username"] == username
     assert result["id"] == 'test-uuid'
@@ -58,7 +74,7 @@ def test_register_user_already_exists(mock_get_connection):
     mock_cursor = MagicMock()
     mock_conn.cursor.return_value = mock_cursor
     mock_get_connection.return_value = mock_conn
-    mock_cursor.fetchone.return_value = {"id": "existing-id", "username": "existing_user"}
+    mock_cursor.rowcount = 0  # ON CONFLICT DO NOTHING inserted no row
     username = "existing_user"
     password = "secure_password"
     
@@ -78,9 +94,8 @@ def test_register_user_database_error(mock_get_connection):
     mock_cursor = MagicMock()
     mock_conn.cursor.return_value = mock_cursor
     mock_get_connection.return_value = mock_conn
-    mock_cursor.fetchone.return_value = None
-    db_error = Exception("Database connection failed")
-    mock_cursor.execute.side_effect = [None, db_error]
+    db_error = sqlite3.OperationalError("Database connection failed")
+    mock_cursor.execute.side_effect = db_error
     username = "new_user"
     password = "secure_password"
     
@@ -100,18 +115,18 @@ def test_verify_user_success(mock_get_connection):
     mock_cursor = MagicMock()
     mock_conn.cursor.return_value = mock_cursor
     mock_get_connection.return_value = mock_conn
-    mock_cursor.fetchone.return_value = ("user-123",)
     username = "existing_user"
     password = "correct_password"
+    salt = "00112233445566778899aabbccddeeff"
+    mock_cursor.fetchone.return_value = ("user-123", user_utils.hash_password(password, salt), salt)
     
     # Act
     result = user_utils.verify_user(username, password)
     
     # Assert
-    hashed_password = user_utils.hash_password(password)
     mock_cursor.execute.assert_called_once_with(
-        "SELECT id FROM Users WHERE username = ? AND password = ?",
-        (username, hashed_password)
+        "SELECT id, password, salt FROM Users WHERE username = ?",
+        (username,)
     )
     mock_conn.close.assert_called_once()
     assert result["status"] == "success"
@@ -134,11 +149,88 @@ def test_verify_user_invalid_credentials(mock_get_connection):
     with pytest.raises(HTTPException) as exc_info:
         user_utils.verify_user(username, password)
     
-    hashed_password = user_utils.hash_password(password)
     mock_cursor.execute.assert_called_once_with(
-        "SELECT id FROM Users WHERE username = ? AND password = ?",
-        (username, hashed_password)
+        "SELECT id, password, salt FROM Users WHERE username = ?",
+        (username,)
     )
     mock_conn.close.assert_called_once()
     assert exc_info.value.status_code == 401
-    assert exc_info.value.detail == "Invalid username or password"
\ No newline at end of file
+    assert exc_info.value.detail == "Invalid username or password"
+
+
+@patch('utils.db_utils.get_db_connection')
+def test_verify_user_wrong_password(mock_get_connection):
+    # Arrange
+    mock_conn = MagicMock()
+    mock_cursor = MagicMock()
+    mock_conn.cursor.return_value = mock_cursor
+    mock_get_connection.return_value = mock_conn
+    salt = "00112233445566778899aabbccddeeff"
+    mock_cursor.fetchone.return_value = ("user-123", user_utils.hash_password("correct_password", salt), salt)
+    
+    # Act & Assert
+    with pytest.raises(HTTPException) as exc_info:
+        user_utils.verify_user("existing_user", "wrong_password")
+    
+    assert exc_info.value.status_code == 401
+
+
+@patch('utils.db_utils.get_db_connection')
+def test_verify_user_legacy_unsalted_password(mock_get_connection):
+    # Arrange
+    mock_conn = MagicMock()
+    mock_cursor = MagicMock()
+    mock_conn.cursor.return_value = mock_cursor
+    mock_get_connection.return_value = mock_conn
+    password = "correct_password"
+    mock_cursor.fetchone.return_value = ("user-123", hashlib.sha256(password.encode()).hexdigest(), None)
+    salt_bytes = bytes(range(16))
+    
+    # Act
+    with patch('os.urandom', return_value=salt_bytes):
+        result = user_utils.verify_user("existing_user", password)
+    
+    # Assert: the row is migrated to a salted scrypt hash
+    salt = salt_bytes.hex()
+    assert result["userId"] == "user-123"
+    mock_conn.execute.assert_called_once_with(
+        "UPDATE Users SET password = ?, salt = ? WHERE id = ? AND salt IS NULL",
+        (user_utils.hash_password(password, salt), salt, "user-123")
+    )
+
+
+@patch('utils.db_utils.get_db_connection')
+def test_verify_user_legacy_wrong_password_costs_a_scrypt(mock_get_connection):
+    # Arrange
+    mock_conn = MagicMock()
+    mock_cursor = MagicMock()
+    mock_conn.cursor.return_value = mock_cursor
+    mock_get_connection.return_value = mock_conn
+    mock_cursor.fetchone.return_value = ("user-123", hashlib.sha256(b"correct_password").hexdigest(), None)
+    
+    # Act & Assert
+    with patch('hashlib.scrypt', wraps=hashlib.scrypt) as mock_scrypt:
+        with pytest.raises(HTTPException) as exc_info:
+            user_utils.verify_user("existing_user", "wrong_password")
+    
+    assert exc_info.value.status_code == 401
+    mock_scrypt.assert_called_once()
+    mock_conn.execute.assert_not_called()
+
+
+@patch('utils.db_utils.get_db_connection')
+def test_verify_user_unknown_username_still_hashes(mock_get_connection):
+    # Arrange
+    mock_conn = MagicMock()
+    mock_cursor = MagicMock()
+    mock_conn.cursor.return_value = mock_cursor
+    mock_get_connection.return_value = mock_conn
+    mock_cursor.fetchone.return_value = None
+    
+    # Act & Assert
+    with patch('utils.user_utils.hash_password', wraps=user_utils.hash_password) as mock_hash:
+        with pytest.raises(HTTPException) as exc_info:
+            user_utils.verify_user("unknown_user", "some_password")
+    
+    assert exc_info.value.status_code == 401
+    mock_hash.assert_called_once()
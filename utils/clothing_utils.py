@@ -1,7 +1,12 @@
 # utils/clothing_utils.py
 import os
-import uuid
+import secrets
+import shutil
+import sqlite3
 import logging  # added import for logging
+import threading
+import time
+from collections import OrderedDict
 from fastapi import HTTPException
 from utils import db_utils
 
@@ -9,6 +14,89 @@ logger = logging.getLogger(__name__)  # initialize logger
 UPLOAD_DIR = os.getenv("UPLOAD_DIR", "uploads")
 os.makedirs(UPLOAD_DIR, exist_ok=True)
 
+# SQL used by this module, kept as constants so every call reuses the same statement text
+SQL_INSERT_CLOTHING = "INSERT INTO Clothing (id, userId, description, image) VALUES (?, ?, ?, ?)"
+SQL_SELECT_DESCRIPTIONS = (
+    "SELECT description FROM Clothing "
+    "WHERE userId = ? AND description IS NOT NULL AND description <> ''"
+)
+
+# Rows fetched per fetchmany call when reading descriptions
+DESCRIPTION_BATCH_SIZE = 1000
+
+# Per-process LRU cache of get_all_clothing_descriptions results, keyed by (database path, userId).
+# Entries are dropped when items are added for that user and expire after DESC_CACHE_TTL_SECONDS,
+# which bounds staleness when several worker processes write to the same database.
+DESC_CACHE_MAXSIZE = 10_000
+DESC_CACHE_TTL_SECONDS = 600
+_DESC_CACHE = OrderedDict()  # key -> (expires_at, descriptions)
+_DESC_CACHE_LOCK = threading.Lock()
+# Token of the latest in-flight read per key; invalidation drops it so that read isn't cached
+_DESC_PENDING = {}
+
+def _invalidate_descriptions(user_id: str):
+    key = (db_utils.get_database_path(), user_id)
+    with _DESC_CACHE_LOCK:
+        _DESC_CACHE.pop(key, None)
+        _DESC_PENDING.pop(key, None)
+
+def clear_description_cache():
+    """
+    Drop every cached description list
+    """
+    with _DESC_CACHE_LOCK:
+        _DESC_CACHE.clear()
+        _DESC_PENDING.clear()
+
+def _save_image(item_id: str, file):
+    """
+    Save an uploaded image under UPLOAD_DIR, named after the item ID
+    
+    Returns:
+        str: The saved image path, or None if the file could not be saved
+    """
+    # UPLOAD_DIR is created at import, so there is no makedirs call per upload
+    
+    # Create the file path - using original extension or default to jpg
+    filename = getattr(file, 'filename', None)
+    if filename is None:
+        file_extension = ".jpg"
+    else:
+        stem, _, extension = filename.rpartition('.')
+        file_extension = f".{extension}" if stem and '/' not in extension else ""
+    image_filename = f"{item_id}{file_extension}"
+    image_path = os.path.join(UPLOAD_DIR, image_filename)
+    
+    # Save the file, streamed in 1 MB chunks rather than read into memory
+    try:
+        # UploadFile objects from FastAPI wrap the file; otherwise it is file-like itself
+        src = file.file if hasattr(file, 'file') else file
+        with open(image_path, "wb") as dst:
+            shutil.copyfileobj(src, dst, length=1024 * 1024)
+            
+        logger.info(f"Image saved to {image_path}")
+        return image_path
+    except Exception as e:
+        logger.error(f"Error saving image: {str(e)}")
+        return None
+
+def _remove_images(image_paths):
+    """
+    Delete images saved for items whose insert was rolled back
+    """
+    for image_path in image_paths:
+        try:
+            os.remove(image_path)
+        except OSError as e:
+            logger.warning(f"Could not remove image {image_path}: {str(e)}")
+
+def _raise_if_unknown_user(error: sqlite3.IntegrityError):
+    """
+    Turn a failed Clothing.userId foreign key into a "User not found" error
+    """
+    if "FOREIGN KEY constraint failed" in str(error):
+        raise HTTPException(status_code=404, detail="User not found")
+
 def add_clothing_item(user_id: str, description: str, file=None):
     """
     Add a clothing item to the appropriate table
@@ -18,93 +106,110 @@ def add_clothing_item(user_id: str, description: str, file=None):
         description (str): Description of the clothing item
         file (UploadFile, optional): The uploaded image file
     """
-    conn = None
-    image_path = None
+    # A batch of one, so single and bulk uploads share the same insert path
+    result = add_clothing_items_bulk(user_id, [(description, file)])
+    item_id = result["ids"][0]
+    logger.info(f"Clothing item added: {item_id}")
+    
+    return {
+        "id": item_id,
+        "image": result["images"][0],
+        "message": "Added item successfully"
+    }
+
+def add_clothing_items_bulk(user_id: str, items: list):
+    """
+    Add several clothing items in a single transaction
+    
+    Args:
+        user_id (str): The ID of the user
+        items (list): Descriptions, or (description, file) pairs for items with an image
+    """
     try:
-        conn = db_utils.get_db_connection()
-        cursor = conn.cursor()
-        
-        # Check if user exists
-        cursor.execute("SELECT id FROM Users WHERE id = ?", (user_id,))
-        if not cursor.fetchone():
-            raise HTTPException(status_code=404, detail="User not found")
+        with db_utils.pooled_connection() as conn:
+            cursor = conn.cursor()
         
-        # Generate a unique ID for the item
-        item_id = str(uuid.uuid4())
+            # Build every row up front so the batch is a single executemany
+            rows = []
+            for item in items:
+                description, file = (item, None) if isinstance(item, str) else item
+                item_id = secrets.token_hex(16)
+                image_path = _save_image(item_id, file) if file else None
+                rows.append((item_id, user_id, description, image_path))
         
-        # Handle the file if provided
-        if file:
-            # Make sure upload directory exists
-            os.makedirs(UPLOAD_DIR, exist_ok=True)
-            
-            # Create the file path - using original extension or default to jpg
-            file_extension = os.path.splitext(file.filename)[1] if hasattr(file, 'filename') else ".jpg"
-            image_filename = f"{item_id}{file_extension}"
-            image_path = os.path.join(UPLOAD_DIR, image_filename)
-            
-            # Save the file
+            # One commit for the whole batch; images saved above are removed if it fails
             try:
-                # For UploadFile objects from FastAPI
-                if hasattr(file, 'file'):
-                    contents = file.file.read()
-                # For file-like objects
-                else:
-                    contents = file.read()
-                    
-                with open(image_path, "wb") as image_file:
-                    image_file.write(contents)
-                    
-                logger.info(f"Image saved to {image_path}")
-            except Exception as e:
-                logger.error(f"Error saving image: {str(e)}")
-                image_path = None
-        
-        # Insert into database with image path if available
-        if image_path:
-            cursor.execute(
-                "INSERT INTO Clothing (id, userId, description, image) VALUES (?, ?, ?, ?)",
-                (item_id, user_id, description, image_path)
-            )
-        else:
-            cursor.execute(
-                "INSERT INTO Clothing (id, userId, description) VALUES (?, ?, ?)",
-                (item_id, user_id, description)
-            )
-
-        conn.commit()
-        logger.info(f"Clothing item added: {item_id}")
+                with db_utils.transaction(conn):
+                    try:
+                        cursor.executemany(
+                            SQL_INSERT_CLOTHING,
+                            rows
+                        )
+                    except sqlite3.IntegrityError as e:
+                        _raise_if_unknown_user(e)
+                        raise
+            except Exception:
+                _remove_images([row[3] for row in rows if row[3]])
+                raise
+        _invalidate_descriptions(user_id)
+        item_ids = [row[0] for row in rows]
+        logger.info(f"{len(item_ids)} clothing items added for user {user_id}")
         
         return {
-            "id": item_id,
-            "image": image_path,
-            "message": "Added item successfully"
+            "ids": item_ids,
+            "images": [row[3] for row in rows],
+            "count": len(item_ids),
+            "message": "Added items successfully"
         }
-    except Exception as e:
-        if conn:
-            conn.rollback()
-        logger.error(f"Error adding clothing item for user {user_id}: {str(e)}")
+    except sqlite3.Error as e:
+        logger.error(f"Error adding clothing items for user {user_id}: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
-    finally:
-        if conn:
-            conn.close()
+
+def _fetch_descriptions(conn, userId: str, batch_size: int):
+    """
+    Yield a user's clothing descriptions from conn, batch_size rows at a time
+    """
+    cursor = conn.cursor()
+    # Using ? placeholder which is common in SQLite; empty descriptions are skipped in SQL
+    cursor.execute(SQL_SELECT_DESCRIPTIONS, (userId,))
+    while True:
+        rows = cursor.fetchmany(batch_size)
+        if not rows:
+            break
+        for row in rows:
+            yield row[0]
 
 def get_all_clothing_descriptions(userId: str):
     """
     Retrieve all clothing item descriptions from all clothing tables.
+    Results are cached per user until that user adds an item or the entry expires.
     """
-    conn = db_utils.get_db_connection()
-    cursor = conn.cursor()
+    key = (db_utils.get_database_path(), userId)
+    token = object()
+    with _DESC_CACHE_LOCK:
+        entry = _DESC_CACHE.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            _DESC_CACHE.move_to_end(key)
+            return list(entry[1])
+        _DESC_PENDING[key] = token
     
+    descriptions = None
     try:
-        # Using ? placeholder which is common in SQLite
-        cursor.execute("SELECT description FROM Clothing WHERE userId = ?", (userId,))
-        results = cursor.fetchall()
-        descriptions = [row[0] for row in results if row and row[0]]
-    except Exception as e:
-        # Log the error
-        print(f"Error fetching clothing descriptions: {str(e)}")
-        descriptions = []
+        with db_utils.pooled_connection() as conn:
+            try:
+                descriptions = list(_fetch_descriptions(conn, userId, DESCRIPTION_BATCH_SIZE))
+            except sqlite3.Error as e:
+                # Log the error; failed reads are not cached
+                logger.error(f"Error fetching clothing descriptions: {str(e)}")
+                return []
     finally:
-        conn.close()
-    
-    return descriptions
\ No newline at end of file
+        with _DESC_CACHE_LOCK:
+            # Cache only if no write for this user happened while reading
+            if _DESC_PENDING.get(key) is token:
+                del _DESC_PENDING[key]
+                if descriptions is not None:
+                    _DESC_CACHE[key] = (time.monotonic() + DESC_CACHE_TTL_SECONDS, tuple(descriptions))
+                    _DESC_CACHE.move_to_end(key)
+                    if len(_DESC_CACHE) > DESC_CACHE_MAXSIZE:
+                        _DESC_CACHE.popitem(last=False)
+    return descriptions
@@ -1,142 +1,367 @@
 # utils/db_utils.py
 import os
+import queue
+import atexit
 import sqlite3
+import logging
+import threading
+from contextlib import contextmanager
+from functools import lru_cache
 from fastapi import HTTPException
 
-# Set the database file path
-DATABASE_PATH = os.getenv("SQLITE_DB_PATH", "faishion.db")
+logger = logging.getLogger(__name__)
+
+# Default database file path, used when SQLITE_DB_PATH is not set
+DATABASE_PATH = "faishion.db"
+
+def get_database_path():
+    """
+    Returns the database path, read from SQLITE_DB_PATH on every call so it can be changed at runtime
+    """
+    return os.getenv("SQLITE_DB_PATH", DATABASE_PATH)
+
+def is_memory_database(path):
+    """
+    True for in-memory databases (":memory:" or a "file:" URI with mode=memory)
+    """
+    return path == ":memory:" or (path.startswith("file:") and "mode=memory" in path)
+
+# At most POOL_SIZE connections per database path are open and in use at once; a borrower
+# waits up to POOL_TIMEOUT_SECONDS for one to come back. Returned connections are kept for reuse.
+POOL_SIZE = int(os.getenv("SQLITE_POOL_SIZE", "8"))
+POOL_TIMEOUT_SECONDS = float(os.getenv("SQLITE_POOL_TIMEOUT", "30"))
+# Database path -> (idle connection queue, semaphore counting borrowed connections)
+_pools = {}
+_pools_lock = threading.Lock()
+
+class PooledConnection(sqlite3.Connection):
+    """
+    sqlite3 connection that goes back to its pool instead of closing
+
+    close() returns the connection to the pool and discard() really closes it.
+    A "with conn:" block only commits or rolls back, as for a plain connection;
+    use pooled_connection() to borrow a connection for a block
+    """
+    pool_path = None
+    pool_slot = None
+    in_pool = False
+
+    def close(self):
+        release_db_connection(self)
+
+    def discard(self):
+        super().close()
+
+def _discard(conn):
+    if isinstance(conn, PooledConnection):
+        conn.discard()
+    else:
+        conn.close()
+
+def _get_pool(path):
+    with _pools_lock:
+        pool = _pools.get(path)
+        if pool is None:
+            # LIFO hands out the most recently used connection, whose page cache is warmest
+            pool = _pools[path] = (queue.LifoQueue(maxsize=POOL_SIZE), threading.BoundedSemaphore(POOL_SIZE))
+        return pool
+
+def _make_conn(path):
+    """
+    Opens a new pooled connection and applies the per-connection PRAGMAs once
+    """
+    # "file:" paths are URIs, e.g. shared-cache in-memory databases.
+    # Pooled connections may be handed to another thread, one user at a time.
+    conn = sqlite3.connect(
+        path,
+        uri=path.startswith("file:"),
+        check_same_thread=False,
+        factory=PooledConnection,
+        # Keep more prepared statements around than the default 128
+        cached_statements=256,
+        # Autocommit: single statements commit on their own, multi-statement work uses transaction()
+        isolation_level=None
+    )
+    conn.pool_path = path
+    # Enable foreign keys support
+    conn.execute("PRAGMA foreign_keys = ON")
+    # WAL lets readers run alongside a writer; in-memory databases don't support it
+    if not is_memory_database(path):
+        conn.execute("PRAGMA journal_mode = WAL")
+    # WAL is durable with NORMAL sync; keep temp tables and a 64 MB page cache in memory.
+    # The connection is pooled, so the warm cache outlives each request.
+    conn.execute("PRAGMA synchronous = NORMAL")
+    conn.execute("PRAGMA temp_store = MEMORY")
+    conn.execute("PRAGMA cache_size = -64000")
+    conn.execute("PRAGMA mmap_size = 268435456")
+    # Rows stay plain tuples: every caller reads columns by position
+    return conn
 
 def get_db_connection():
     """
-    Creates and returns a database connection to SQLite
+    Returns a pooled database connection to SQLite, opening a new one if none is idle
+
+    Waits while POOL_SIZE connections are already borrowed
     """
+    path = get_database_path()
+    idle, slots = _get_pool(path)
+    if not slots.acquire(timeout=POOL_TIMEOUT_SECONDS):
+        logger.error(f"No database connection freed up within {POOL_TIMEOUT_SECONDS}s")
+        raise HTTPException(status_code=503, detail="Database connection pool exhausted")
+    
+    conn = None
     try:
-        conn = sqlite3.connect(DATABASE_PATH)
-        # Enable foreign keys support
-        conn.execute("PRAGMA foreign_keys = ON")
-        # Return dictionary-like rows
-        conn.row_factory = sqlite3.Row
-        return conn
-    except Exception as e:
-        print(f"Database connection error: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Database connection error: {str(e)}")
-
-def create_users_table():
+        conn = idle.get_nowait()
+        conn.in_pool = False
+    except queue.Empty:
+        try:
+            conn = _make_conn(path)
+        except sqlite3.Error as e:
+            logger.error(f"Database connection error: {str(e)}")
+            raise HTTPException(status_code=500, detail=f"Database connection error: {str(e)}")
+    finally:
+        if conn is None:
+            slots.release()
+    conn.pool_slot = slots
+    return conn
+
+def release_db_connection(conn):
     """
-    Creates the Users table if it doesn't exist
+    Returns a connection to its pool, rolling back anything left uncommitted
     """
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    
+    if isinstance(conn, PooledConnection):
+        if conn.in_pool:
+            return
+        # Free the borrowed slot exactly once, whether the connection is kept or discarded
+        slot, conn.pool_slot = conn.pool_slot, None
+    else:
+        slot = None
     try:
-        print("Creating Users table...")
-        cursor.execute("""
-        CREATE TABLE IF NOT EXISTS Users (
-            id TEXT PRIMARY KEY,
-            username TEXT NOT NULL UNIQUE,
-            password TEXT NOT NULL
-        )
-        """)
-        conn.commit()
-        print("Users table creation successful")
-    except Exception as e:
-        print(f"Error creating Users table: {str(e)}")
-        conn.rollback()
+        _return_to_pool(conn)
     finally:
-        conn.close()
+        if slot is not None:
+            slot.release()
 
-def create_clothing_table():
+def _return_to_pool(conn):
+    try:
+        conn.rollback()
+    except sqlite3.Error:
+        _discard(conn)
+        return
+    
+    pool = _pools.get(conn.pool_path) if isinstance(conn, PooledConnection) else None
+    if pool is None:
+        _discard(conn)
+        return
+    idle, _ = pool
+    try:
+        conn.in_pool = True
+        idle.put_nowait(conn)
+    except queue.Full:
+        conn.in_pool = False
+        _discard(conn)
+
+@contextmanager
+def pooled_connection():
     """
-    Creates a single Clothing table for all clothing items
+    Borrows a connection from the pool for the duration of the block
     """
     conn = get_db_connection()
-    cursor = conn.cursor()
-    
     try:
-        print("Creating Clothing table...")
-        cursor.execute("""
-        CREATE TABLE IF NOT EXISTS Clothing (
-            id TEXT PRIMARY KEY,
-            userId TEXT NOT NULL,
-            description TEXT,
-            image TEXT,
-            FOREIGN KEY (userId) REFERENCES Users(id)
-        )
-        """)
-        conn.commit()
-        print("Clothing table creation successful")
-    except Exception as e:
-        print(f"Error creating Clothing table: {str(e)}")
-        conn.rollback()
+        yield conn
     finally:
-        conn.close()
+        release_db_connection(conn)
 
-def init_db():
+@contextmanager
+def transaction(conn):
     """
-    Initialize all database tables with better error handling
+    Groups the statements run in the block under one BEGIN IMMEDIATE ... COMMIT, rolling back on error
+
+    IMMEDIATE takes the write lock up front, so a batch can't fail with "database is locked" halfway through
     """
-    print("Starting database initialization...")
+    conn.execute("BEGIN IMMEDIATE")
     try:
-        # First check connection
-        conn = get_db_connection()
+        yield conn
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
+
+def reset_pool():
+    """
+    Closes every idle pooled connection and forgets all pools
+    """
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for idle, _ in pools:
+        while True:
+            try:
+                idle.get_nowait().discard()
+            except queue.Empty:
+                break
+
+atexit.register(reset_pool)
+
+# Schema DDL, shared by the create_* helpers and init_db
+USERS_TABLE_DDL = """
+CREATE TABLE IF NOT EXISTS Users (
+    id TEXT PRIMARY KEY,
+    username TEXT NOT NULL UNIQUE,
+    password TEXT NOT NULL,
+    salt TEXT
+)
+"""
+
+CLOTHING_TABLE_DDL = """
+CREATE TABLE IF NOT EXISTS Clothing (
+    id TEXT PRIMARY KEY,
+    userId TEXT NOT NULL,
+    description TEXT,
+    image TEXT,
+    FOREIGN KEY (userId) REFERENCES Users(id)
+)
+"""
+
+# Covers "SELECT description ... WHERE userId = ?" so it is served from the index alone
+CLOTHING_INDEX_DDL = """
+CREATE INDEX IF NOT EXISTS idx_clothing_user_desc ON Clothing(userId, description)
+"""
+
+# The whole schema, created in a single transaction by init_db
+SCHEMA_DDL = (USERS_TABLE_DDL, CLOTHING_TABLE_DDL, CLOTHING_INDEX_DDL)
+
+@contextmanager
+def db_cursor():
+    """
+    Yields a cursor on a pooled connection, committing on success and rolling back on error
+
+    The connection goes back to the pool when the block exits, so no thread keeps one
+    """
+    with pooled_connection() as conn:
         cursor = conn.cursor()
-        cursor.execute("SELECT 1")
-        conn.close()
-        print("Database connection successful")
-        
-        # Create tables
-        create_users_table()
-        create_clothing_table()
-        
-        print("Database initialization completed")
-    except Exception as e:
-        print(f"Database initialization failed: {str(e)}")
+        try:
+            # Connections are in autocommit mode, so open the transaction explicitly
+            cursor.execute("BEGIN")
+            yield cursor
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            cursor.close()
 
-def get_tables():
+def create_users_table(cursor=None):
     """
-    Get a list of all tables in the database
+    Creates the Users table if it doesn't exist
+
+    When a cursor is passed the DDL runs in the caller's transaction and errors propagate
     """
-    conn = get_db_connection()
-    cursor = conn.cursor()
+    if cursor is not None:
+        cursor.execute(USERS_TABLE_DDL)
+        return
+    
+    try:
+        logger.debug("Creating Users table...")
+        with db_cursor() as cursor:
+            cursor.execute(USERS_TABLE_DDL)
+        clear_tables_cache()
+        logger.debug("Users table creation successful")
+    except (sqlite3.Error, HTTPException) as e:
+        logger.error(f"Error creating Users table: {str(e)}")
+
+def create_clothing_table(cursor=None):
+    """
+    Creates a single Clothing table for all clothing items
+
+    When a cursor is passed the DDL runs in the caller's transaction and errors propagate
+    """
+    if cursor is not None:
+        cursor.execute(CLOTHING_TABLE_DDL)
+        cursor.execute(CLOTHING_INDEX_DDL)
+        return
     
     try:
+        logger.debug("Creating Clothing table...")
+        with db_cursor() as cursor:
+            cursor.execute(CLOTHING_TABLE_DDL)
+            cursor.execute(CLOTHING_INDEX_DDL)
+        clear_tables_cache()
+        logger.debug("Clothing table creation successful")
+    except (sqlite3.Error, HTTPException) as e:
+        logger.error(f"Error creating Clothing table: {str(e)}")
+
+def add_users_salt_column(cursor):
+    """
+    Adds the salt column to a Users table created before passwords were salted
+    """
+    cursor.execute("PRAGMA table_info(Users)")
+    if "salt" not in [row[1] for row in cursor.fetchall()]:
+        cursor.execute("ALTER TABLE Users ADD COLUMN salt TEXT")
+
+def init_db():
+    """
+    Initialize all database tables with better error handling
+    """
+    logger.debug("Starting database initialization...")
+    try:
+        # One cursor for the connection check and the whole schema, in a single transaction
+        with db_cursor() as cursor:
+            cursor.execute("SELECT 1")
+            logger.debug("Database connection successful")
+            
+            logger.debug("Creating tables...")
+            for ddl in SCHEMA_DDL:
+                cursor.execute(ddl)
+            add_users_salt_column(cursor)
+        logger.debug("Table creation successful")
+        clear_tables_cache()
+        
+        logger.debug("Database initialization completed")
+    except (sqlite3.Error, HTTPException) as e:
+        logger.error(f"Database initialization failed: {str(e)}")
+
+@lru_cache(maxsize=8)
+def _table_names(path):
+    # Cached per database path; only successful lookups are cached
+    with db_cursor() as cursor:
         cursor.execute("""
         SELECT name FROM sqlite_master 
         WHERE type='table' AND name NOT LIKE 'sqlite_%'
         """)
         
-        tables = [row[0] for row in cursor.fetchall()]
-        conn.close()
-        return {"tables": tables}
-    except Exception as e:
-        conn.close()
+        return tuple(row[0] for row in cursor.fetchall())
+
+def clear_tables_cache():
+    """
+    Forget the cached table names, e.g. after the schema changes
+    """
+    _table_names.cache_clear()
+
+def get_tables():
+    """
+    Get a list of all tables in the database, cached until the schema is (re)created
+    """
+    try:
+        return {"tables": list(_table_names(get_database_path()))}
+    except (sqlite3.Error, HTTPException) as e:
         raise HTTPException(status_code=500, detail=f"Error getting tables: {str(e)}")
 
 def check_db_connection():
     """
     Check if database connection is working
+
+    Not cached here: app.main already serves /health from a cached, background-refreshed result
     """
-    print("Checking database connection...")
+    logger.debug("Checking database connection...")
     try:
-        # First check if the database file exists
-        if os.path.exists(DATABASE_PATH):
-            print(f"Database file exists at {DATABASE_PATH}")
-        else:
-            print(f"Database file does not exist at {DATABASE_PATH}")
-            return {"status": "error", "error_message": f"Database file not found at {DATABASE_PATH}"}
-        
-        # Try to open a connection
-        print("Attempting to connect to database...")
-        conn = get_db_connection()
-        print("Connection established, executing test query...")
-        
-        cursor = conn.cursor()
-        cursor.execute("SELECT 1")
-        result = cursor.fetchone()
-        conn.close()
+        with db_cursor() as cursor:
+            cursor.execute("SELECT 1")
+            result = cursor.fetchone()
         
-        print(f"Query result: {result}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Database check query returned {result}")
         return {"status": "connected" if result and result[0] == 1 else "error"}
-    except Exception as e:
-        print(f"Database connection error: {str(e)}")
-        return {"status": "error", "error_message": str(e)}
\ No newline at end of file
+    except (sqlite3.Error, HTTPException) as e:
+        logger.error(f"Database connection error: {str(e)}")
+        return {"status": "error", "error_message": str(e)}
@@ -1,72 +1,109 @@
 # utils/user_utils.py
+import os
+import hmac
 import hashlib
-import uuid
+import secrets
+import sqlite3
 import logging  # added import for logging
 from fastapi import HTTPException
 from utils import db_utils
 
 logger = logging.getLogger(__name__)  # initialize logger
 
-def hash_password(password: str) -> str:
+# SQL used by this module, kept as constants so every call reuses the same statement text
+SQL_INSERT_USER = (
+    "INSERT INTO Users (id, username, password, salt) VALUES (?, ?, ?, ?) "
+    "ON CONFLICT(username) DO NOTHING"
+)
+SQL_SELECT_CREDENTIALS = "SELECT id, password, salt FROM Users WHERE username = ?"
+SQL_UPGRADE_LEGACY_PASSWORD = "UPDATE Users SET password = ?, salt = ? WHERE id = ? AND salt IS NULL"
+
+# Salt for the throwaway hash verify_user computes when the username doesn't exist
+_DUMMY_SALT = os.urandom(16).hex()
+
+def hash_password(password: str, salt: str = None) -> str:
     """
-    Hash a password using SHA-256
+    Hash a password with scrypt using the user's hex-encoded salt
+
+    Without a salt this is the legacy unsalted SHA-256 hash, still used to verify
+    users registered before salts were stored
     """
-    return hashlib.sha256(password.encode()).hexdigest()
+    if salt is None:
+        return hashlib.sha256(password.encode()).hexdigest()
+    return hashlib.scrypt(password.encode(), salt=bytes.fromhex(salt), n=2**14, r=8, p=1, dklen=32).hex()
 
 def register_user(username: str, password: str):
     """
     Register a new user
     """
-    conn = db_utils.get_db_connection()
-    cursor = conn.cursor()
+    # Generate a unique ID for the user
+    user_id = secrets.token_hex(16)
+    salt = os.urandom(16).hex()
+    hashed_password = hash_password(password, salt)
     
-    # Check if username already exists
-    cursor.execute("SELECT * FROM Users WHERE username = ?", (username,))
-    if cursor.fetchone():
-        conn.close()
+    # The connection goes back to the pool when the block exits
+    with db_utils.pooled_connection() as conn:
+        cursor = conn.cursor()
+        
+        # Insert new user; a taken username inserts nothing instead of needing a separate check.
+        # The connection is in autocommit mode, so the single INSERT commits on its own.
+        try:
+            cursor.execute(SQL_INSERT_USER, (user_id, username, hashed_password, salt))
+            inserted = cursor.rowcount
+        except sqlite3.Error as e:
+            logger.error(f"Error registering user {username}: {str(e)}")  # added logging
+            raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
+    
+    if inserted == 0:
         logger.warning(f"Attempt to register already existing username: {username}")  # added logging
         raise HTTPException(status_code=400, detail="Username already registered")
     
-    # Generate a unique ID for the user
-    user_id = str(uuid.uuid4())
-    hashed_password = hash_password(password)
-    
-    # Insert new user
+    logger.info(f"User registered successfully: {username}")  # added logging
+    return {"id": user_id, "username": username, "message": "User registered successfully"}
+
+def _upgrade_legacy_password(user_id: str, password: str):
+    """
+    Replace a user's legacy unsalted hash with a salted scrypt hash after a successful login
+    """
+    salt = os.urandom(16).hex()
+    hashed_password = hash_password(password, salt)
     try:
-        cursor.execute(
-            "INSERT INTO Users (id, username, password) VALUES (?, ?, ?)",
-            (user_id, username, hashed_password)
-        )
-        conn.commit()
-        logger.info(f"User registered successfully: {username}")  # added logging
-        conn.close()
-        return {"id": user_id, "username": username, "message": "User registered successfully"}
-    except Exception as e:
-        conn.close()
-        logger.error(f"Error registering user {username}: {str(e)}")  # added logging
-        raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
+        with db_utils.pooled_connection() as conn:
+            conn.execute(SQL_UPGRADE_LEGACY_PASSWORD, (hashed_password, salt, user_id))
+    except sqlite3.Error as e:
+        # The login still succeeds; the upgrade is retried on the next one
+        logger.error(f"Error upgrading legacy password hash for user {user_id}: {str(e)}")
 
 def verify_user(username: str, password: str):
     """
     Verify user credentials
     """
-    conn = db_utils.get_db_connection()
-    cursor = conn.cursor()
+    with db_utils.pooled_connection() as conn:
+        cursor = conn.cursor()
+        
+        # The hash depends on the user's salt, so fetch it before checking the password
+        cursor.execute(SQL_SELECT_CREDENTIALS, (username,))
+        
+        result = cursor.fetchone()
     
-    hashed_password = hash_password(password)
-    
-    # Check credentials
-    cursor.execute(
-        "SELECT id FROM Users WHERE username = ? AND password = ?",
-        (username, hashed_password)
-    )
-    
-    result = cursor.fetchone()
-    conn.close()
+    # Every path runs exactly one scrypt, so response times don't reveal which usernames
+    # exist or which accounts still have a legacy hash
+    if result is None:
+        hash_password(password, _DUMMY_SALT)
+        verified = False
+    elif result[2] is None:
+        # Legacy unsalted SHA-256 row: upgrade it on success, otherwise spend the same scrypt
+        verified = hmac.compare_digest(hash_password(password), result[1])
+        if verified:
+            _upgrade_legacy_password(result[0], password)
+        else:
+            hash_password(password, _DUMMY_SALT)
+    else:
+        verified = hmac.compare_digest(hash_password(password, result[2]), result[1])
     
-    if result:
+    if verified:
         logger.info(f"User verified successfully: {username}")  # added logging
         return {"status": "success", "userId": result[0], "message": "Login successful"}
     else:
         logger.warning(f"Failed login attempt for username: {username}")  # added logging
-        raise HTTPException(status_code=401, detail="Invalid username or password")
\ No newline at end of file
+        raise HTTPException(status_code=401, detail="Invalid username or password")